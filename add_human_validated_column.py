@@ -16,17 +16,23 @@ def migrate_database(db_path='./haiku.db'):
 
         if 'human_validated' in columns:
             print("✓ Column 'human_validated' already exists")
-            return True
-
-        # Add the column
-        print("Adding 'human_validated' column to lines table...")
+        else:
+            # Add the column
+            print("Adding 'human_validated' column to lines table...")
+            cursor.execute("""
+                ALTER TABLE lines
+                ADD COLUMN human_validated BOOLEAN NOT NULL DEFAULT 0
+            """)
+            print("✓ Successfully added 'human_validated' column")
+
+        # Partial index covering only unvalidated lines (used by syllable check)
         cursor.execute("""
-            ALTER TABLE lines
-            ADD COLUMN human_validated BOOLEAN NOT NULL DEFAULT 0
+            CREATE INDEX IF NOT EXISTS idx_lines_unvalidated_ts
+            ON lines(timestamp) WHERE human_validated IS 0
         """)
+        print("✓ Index 'idx_lines_unvalidated_ts' is present")
 
         conn.commit()
-        print("✓ Successfully added 'human_validated' column")
         return True
 
     except sqlite3.Error as e:
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Migration script to add the denormalized vote_count column to generated_haikus.
+
+init_db() applies this automatically on startup; the script remains for
+migrating a database without starting the bot.
+"""
+
+import sqlite3
+import sys
+
+def migrate_database(db_path='./haiku.db'):
+    """Add vote_count column to generated_haikus and backfill it from votes."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        # Check if column already exists
+        cursor.execute("PRAGMA table_info(generated_haikus)")
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if 'vote_count' in columns:
+            print("✓ Column 'vote_count' already exists")
+            return True
+
+        # Add the column
+        print("Adding 'vote_count' column to generated_haikus table...")
+        cursor.execute("""
+            ALTER TABLE generated_haikus
+            ADD COLUMN vote_count INTEGER NOT NULL DEFAULT 0
+        """)
+
+        # Backfill from existing votes
+        print("Backfilling vote counts...")
+        cursor.execute("""
+            UPDATE generated_haikus
+            SET vote_count = (
+                SELECT COUNT(*) FROM votes WHERE votes.haiku_id = generated_haikus.id
+            )
+        """)
+
+        conn.commit()
+        print("✓ Successfully added 'vote_count' column")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"✗ Error: {e}")
+        conn.rollback()
+        return False
+
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    db_path = sys.argv[1] if len(sys.argv) > 1 else './haiku.db'
+    print(f"Migrating database: {db_path}")
+    success = migrate_database(db_path)
+    sys.exit(0 if success else 1)
@@ -1,14 +1,22 @@
 """Admin API routes for HaikuBot maintenance."""
 
+import base64
+import binascii
+import hashlib
+import hmac
 import logging
+import secrets
+import time
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, Depends, Header
 from pydantic import BaseModel
+from sqlalchemy import select
 
 from ..config import get_config
-from ..database import get_session, Line, GeneratedHaiku
-from ..haiku.syllable_counter import count_syllables
+from ..database import get_session, Line, GeneratedHaiku, Vote
+from ..haiku.syllable_counter import count_syllables_bulk
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +43,12 @@ class LineUpdate(BaseModel):
     placement: Optional[str] = None
 
 
+class DateRangeParams(BaseModel):
+    """Optional date range query parameters, parsed and validated by Pydantic."""
+    start_date: Optional[datetime] = None  # ISO format (YYYY-MM-DD or full datetime)
+    end_date: Optional[datetime] = None
+
+
 class SyllableCheckResult(BaseModel):
     """Result of syllable check for a line."""
     id: int
@@ -48,24 +62,90 @@ class SyllableCheckResult(BaseModel):
     method: str  # Which counting method was used
 
 
-# Simple authentication (just checks credentials from config)
+# Token authentication
+#
+# Tokens are "<payload>.<signature>" where payload is base64("username|issued_at")
+# and signature is an HMAC-SHA256 of the payload keyed by admin.secret_key.
+
+# Fallback signing key when admin.secret_key is not configured
+_EPHEMERAL_SECRET = secrets.token_bytes(32)
+
+
+def _token_secret() -> bytes:
+    """Get the key used to sign admin tokens."""
+    secret_key = get_config().admin.secret_key
+    return secret_key.encode() if secret_key else _EPHEMERAL_SECRET
+
+
+def _sign(payload: bytes, secret: bytes) -> bytes:
+    """Compute the HMAC-SHA256 signature for a token payload."""
+    return hmac.new(secret, payload, hashlib.sha256).digest()
+
+
+def _credentials_match(username: str, password: str) -> bool:
+    """Compare credentials against config in constant time."""
+    admin = get_config().admin
+    username_ok = hmac.compare_digest(username.encode(), admin.username.encode())
+    password_ok = hmac.compare_digest(password.encode(), admin.password.encode())
+    return username_ok and password_ok
+
+
+def _create_token(username: str) -> str:
+    """Create a signed admin token for username."""
+    payload = base64.urlsafe_b64encode(f"{username}|{int(time.time())}".encode())
+    signature = base64.urlsafe_b64encode(_sign(payload, _token_secret()))
+    return f"{payload.decode()}.{signature.decode()}"
+
+
+def _decode_token(token: str) -> Optional[Tuple[str, int]]:
+    """Verify a token's signature against the current key.
+
+    Returns:
+        (username, issued_at) or None if the token is malformed or forged
+    """
+    return _verify_token(token, _token_secret())
+
+
+@lru_cache(maxsize=256)
+def _verify_token(token: str, secret: bytes) -> Optional[Tuple[str, int]]:
+    """Verify a token's signature with secret and return (username, issued_at).
+
+    Cached by (token, secret) so repeat requests skip the HMAC, while a
+    changed secret_key still invalidates old tokens; expiry is checked by
+    the caller on every request.
+
+    Returns:
+        (username, issued_at) or None if the token is malformed or forged
+    """
+    try:
+        payload, signature = token.encode().split(b".", 1)
+        provided = base64.urlsafe_b64decode(signature)
+        if not hmac.compare_digest(_sign(payload, secret), provided):
+            return None
+        username, issued_at = base64.urlsafe_b64decode(payload).decode().split("|", 1)
+        return username, int(issued_at)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
 def verify_admin_token(authorization: str = Header(None)) -> bool:
     """Verify admin token from Authorization header.
 
-    Token format: "Bearer username:password"
+    Token format: "Bearer <token>" where token comes from /admin/login
     """
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Unauthorized")
 
-    token = authorization[7:]  # Remove "Bearer "
-    try:
-        username, password = token.split(":", 1)
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid token format")
+    decoded = _decode_token(authorization[7:])  # Remove "Bearer "
+    if decoded is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
 
-    config = get_config()
-    if username != config.admin.username or password != config.admin.password:
+    username, issued_at = decoded
+    admin = get_config().admin
+    if username != admin.username:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    if time.time() - issued_at > admin.token_ttl_hours * 3600:
+        raise HTTPException(status_code=401, detail="Token expired")
 
     return True
 
@@ -74,23 +154,17 @@ def verify_admin_token(authorization: str = Header(None)) -> bool:
 def admin_login(request: LoginRequest) -> LoginResponse:
     """Admin login endpoint.
 
-    Returns a simple token (username:password) for subsequent requests.
+    Returns a signed, expiring token for subsequent requests.
     """
-    config = get_config()
-
-    if request.username != config.admin.username or request.password != config.admin.password:
+    if not _credentials_match(request.username, request.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    # Simple token: just base64 would be better, but keeping it simple
-    token = f"{request.username}:{request.password}"
-
-    return LoginResponse(success=True, token=token)
+    return LoginResponse(success=True, token=_create_token(request.username))
 
 
 @router.get("/lines")
 def list_lines(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    dates: DateRangeParams = Depends(),
     syllable_count: Optional[int] = None,
     search: Optional[str] = None,
     skip: int = 0,
@@ -111,19 +185,11 @@ def list_lines(
         query = session.query(Line)
 
         # Apply filters
-        if start_date:
-            try:
-                start_dt = datetime.fromisoformat(start_date)
-                query = query.filter(Line.timestamp >= start_dt)
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid start_date format")
-
-        if end_date:
-            try:
-                end_dt = datetime.fromisoformat(end_date)
-                query = query.filter(Line.timestamp <= end_dt)
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid end_date format")
+        if dates.start_date:
+            query = query.filter(Line.timestamp >= dates.start_date)
+
+        if dates.end_date:
+            query = query.filter(Line.timestamp <= dates.end_date)
 
         if syllable_count:
             query = query.filter(Line.syllable_count == syllable_count)
@@ -178,14 +244,20 @@ def delete_line(
             raise HTTPException(status_code=404, detail="Line not found")
 
         # Check if line is used in any haikus
-        haikus_using_line = session.query(GeneratedHaiku).filter(
+        uses_line = (
             (GeneratedHaiku.line1_id == line_id) |
             (GeneratedHaiku.line2_id == line_id) |
             (GeneratedHaiku.line3_id == line_id)
-        ).all()
+        )
+        in_use = session.query(
+            session.query(GeneratedHaiku.id).filter(uses_line).exists()
+        ).scalar()
 
-        if haikus_using_line and not cascade:
+        if in_use and not cascade:
             # Return error with details about haikus using this line
+            haikus_using_line = session.query(
+                GeneratedHaiku.id, GeneratedHaiku.full_text
+            ).filter(uses_line).all()
             raise HTTPException(
                 status_code=409,
                 detail={
@@ -198,11 +270,17 @@ def delete_line(
                 }
             )
 
-        # If cascade, delete all haikus using this line first
-        if cascade and haikus_using_line:
-            for haiku in haikus_using_line:
-                session.delete(haiku)
-            logger.info(f"Admin cascade deleted {len(haikus_using_line)} haiku(s) using line {line_id}")
+        # If cascade, delete all haikus using this line (and their votes) first
+        cascade_deleted = 0
+        if cascade and in_use:
+            haiku_ids = session.query(GeneratedHaiku.id).filter(uses_line).scalar_subquery()
+            session.query(Vote).filter(
+                Vote.haiku_id.in_(haiku_ids)
+            ).delete(synchronize_session=False)
+            cascade_deleted = session.query(GeneratedHaiku).filter(
+                uses_line
+            ).delete(synchronize_session=False)
+            logger.info(f"Admin cascade deleted {cascade_deleted} haiku(s) using line {line_id}")
 
         session.delete(line)
         session.commit()
@@ -212,7 +290,7 @@ def delete_line(
         return {
             "success": True,
             "message": f"Deleted line {line_id}",
-            "cascade_deleted_haikus": len(haikus_using_line) if cascade else 0
+            "cascade_deleted_haikus": cascade_deleted
         }
 
 
@@ -298,8 +376,7 @@ def validate_line_syllables(
 
 @router.post("/syllable-check")
 def check_syllables(
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
+    dates: DateRangeParams = Depends(),
     method: str = "perl",
     include_validated: bool = False,
     _authenticated: bool = Depends(verify_admin_token)
@@ -307,44 +384,42 @@ def check_syllables(
     """Check syllable counts for lines in date range.
 
     Args:
-        start_date: Optional start date filter (ISO format)
-        end_date: Optional end date filter (ISO format)
+        dates: Optional start_date/end_date filters (ISO format)
         method: Syllable counting method - "perl" (most accurate) or "python"
         include_validated: Include human-validated lines in results (default: False)
 
     Returns lines where stored syllable count doesn't match actual count.
     """
     with get_session() as session:
-        query = session.query(Line)
+        # Only the columns reported back, not full Line objects
+        stmt = select(
+            Line.id, Line.text, Line.syllable_count,
+            Line.username, Line.channel, Line.timestamp
+        )
 
         # Apply date filters
-        if start_date:
-            try:
-                start_dt = datetime.fromisoformat(start_date)
-                query = query.filter(Line.timestamp >= start_dt)
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid start_date format")
-
-        if end_date:
-            try:
-                end_dt = datetime.fromisoformat(end_date)
-                query = query.filter(Line.timestamp <= end_dt)
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid end_date format")
+        if dates.start_date:
+            stmt = stmt.where(Line.timestamp >= dates.start_date)
+
+        if dates.end_date:
+            stmt = stmt.where(Line.timestamp <= dates.end_date)
 
         # Filter human-validated lines unless explicitly included
         if not include_validated:
-            query = query.filter(Line.human_validated == False)
-
-        lines = query.all()
+            stmt = stmt.where(Line.human_validated.is_(False))
 
-        # Check each line
+        # Recount in batches so each chunk of rows costs one Perl process
+        # instead of one per word, without loading the whole range at once
         results = []
-        for line in lines:
-            actual_count = count_syllables(line.text, method=method)
+        batch_size = 1000
+        stmt = stmt.execution_options(yield_per=batch_size)
+        for batch in session.execute(stmt).partitions():
+            counts = count_syllables_bulk([line.text for line in batch], method=method)
+            for line, actual_count in zip(batch, counts):
+                # Only include if counts don't match
+                if actual_count == line.syllable_count:
+                    continue
 
-            # Only include if counts don't match
-            if actual_count != line.syllable_count:
                 results.append(SyllableCheckResult(
                     id=line.id,
                     text=line.text,
@@ -4,17 +4,30 @@ import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 from pathlib import Path
+from starlette.exceptions import HTTPException
 
 from ..config import Config
-from .routes import router
+from .routes import router, NEXT_CURSOR_HEADER
 from .websocket import websocket_router
 from .admin_routes import router as admin_router
 
 logger = logging.getLogger(__name__)
 
 
+class SPAStaticFiles(StaticFiles):
+    """Static file server that falls back to index.html for client-side routes."""
+
+    async def get_response(self, path: str, scope):
+        try:
+            return await super().get_response(path, scope)
+        except HTTPException as e:
+            # Unknown API/WebSocket paths are real 404s, not SPA routes
+            if e.status_code != 404 or path.startswith(("api/", "ws")):
+                raise
+            return await super().get_response("index.html", scope)
+
+
 def create_app(config: Config) -> FastAPI:
     """Create and configure FastAPI application.
     
@@ -37,6 +50,7 @@ def create_app(config: Config) -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
     
     # Include routers
@@ -44,29 +58,12 @@ def create_app(config: Config) -> FastAPI:
     app.include_router(admin_router, prefix="/api")
     app.include_router(websocket_router)
 
-    # Health check endpoint (must be before catch-all route)
+    # Health check endpoint (must be before the frontend mount)
     @app.get("/health")
     async def health_check():
         """Health check endpoint."""
         return {"status": "healthy"}
 
-    # Serve frontend static files if they exist
-    frontend_dist = Path(__file__).parent.parent.parent / "frontend" / "dist"
-    if frontend_dist.exists():
-        # Mount static assets
-        app.mount("/assets", StaticFiles(directory=str(frontend_dist / "assets")), name="assets")
-
-        # Catch-all route for SPA - serves index.html for all non-API routes
-        @app.get("/{full_path:path}")
-        async def serve_spa(full_path: str):
-            """Serve the React SPA for all routes except API."""
-            index_file = frontend_dist / "index.html"
-            if index_file.exists():
-                return FileResponse(index_file)
-            return {"error": "Frontend not found"}
-
-        logger.info(f"Serving frontend from: {frontend_dist}")
-
     @app.on_event("startup")
     async def startup_event():
         """Run on application startup."""
@@ -76,6 +73,13 @@ def create_app(config: Config) -> FastAPI:
     async def shutdown_event():
         """Run on application shutdown."""
         logger.info("FastAPI application shutting down")
+
+    # Serve the frontend last so it only sees paths no route matched; the
+    # React SPA's own routes fall back to index.html
+    frontend_dist = Path(__file__).parent.parent.parent / "frontend" / "dist"
+    if frontend_dist.exists():
+        app.mount("/", SPAStaticFiles(directory=str(frontend_dist), html=True), name="spa")
+        logger.info(f"Serving frontend from: {frontend_dist}")
     
     return app
 
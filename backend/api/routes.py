@@ -1,13 +1,21 @@
 """REST API routes."""
 
+import base64
+import binascii
 import logging
-from typing import List, Optional
+import random
+from typing import List, Optional, Tuple
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
-from sqlalchemy import func, desc
-
-from ..database import get_session, Line, GeneratedHaiku, Vote, User
+from fastapi import APIRouter, HTTPException, Query, Response
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import func, desc, and_, or_, text, column, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload
+
+from ..database import (
+    get_session, run_in_db_thread, is_haiku_search_enabled, is_line_counts_enabled,
+    Line, GeneratedHaiku, Vote, User, UserLineCount
+)
 from ..haiku import generate_haiku, get_haiku_stats
 from ..utils.auth import get_or_create_user
 
@@ -15,6 +23,19 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Loader options for building HaikuResponse without per-row lazy loads
+_HAIKU_LOAD_OPTIONS = (
+    joinedload(GeneratedHaiku.line1),
+    joinedload(GeneratedHaiku.line2),
+    joinedload(GeneratedHaiku.line3),
+)
+
+# Columns needed for LineResponse, so line listings skip full ORM hydration
+_LINE_RESPONSE_COLUMNS = (
+    Line.id, Line.text, Line.syllable_count, Line.server, Line.channel,
+    Line.username, Line.timestamp, Line.source, Line.placement,
+)
+
 
 # Pydantic models for API responses
 
@@ -29,9 +50,8 @@ class LineResponse(BaseModel):
     timestamp: datetime
     source: str
     placement: Optional[str]
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class HaikuResponse(BaseModel):
@@ -46,9 +66,8 @@ class HaikuResponse(BaseModel):
     line1: LineResponse
     line2: LineResponse
     line3: LineResponse
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class StatsResponse(BaseModel):
@@ -70,12 +89,60 @@ class UserStatsResponse(BaseModel):
     role: str
 
 
+# Cursor pagination helpers
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Encode a (timestamp, id) pair into an opaque pagination cursor."""
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a pagination cursor back into a (timestamp, id) pair.
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        ts_iso, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(ts_iso), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _apply_keyset(query, ts_column, id_column, cursor: Optional[str]):
+    """Order a query newest-first and seek past the cursor position.
+
+    Uses the OR-expanded form of ``(ts, id) < (:ts, :id)`` so the
+    comparison works on SQLite builds without row-value support.
+    """
+    if cursor:
+        cursor_ts, cursor_id = _decode_cursor(cursor)
+        query = query.filter(or_(
+            ts_column < cursor_ts,
+            and_(ts_column == cursor_ts, id_column < cursor_id)
+        ))
+    return query.order_by(desc(ts_column), desc(id_column))
+
+
+def _set_next_cursor(response: Response, rows: list, ts_attr: str, limit: int) -> None:
+    """Expose the cursor for the next page when the page is full."""
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(getattr(last, ts_attr), last.id)
+
+
 # Routes
 
 @router.get("/haikus", response_model=List[HaikuResponse])
 async def list_haikus(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     server: Optional[str] = None,
     channel: Optional[str] = None,
     username: Optional[str] = None,
@@ -83,9 +150,14 @@ async def list_haikus(
 ):
     """List generated haikus with pagination and filters.
 
+    Pass the ``X-Next-Cursor`` header from the previous page as ``cursor``
+    to seek directly to the next page; ``skip`` is kept for older clients.
+
     Args:
-        skip: Number of records to skip
+        response: Outgoing response (used to set the next-page cursor)
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
+        cursor: Opaque cursor from a previous page
         server: Optional server filter
         channel: Optional channel filter
         username: Optional username filter (triggered_by)
@@ -95,7 +167,7 @@ async def list_haikus(
         List of haikus
     """
     with get_session() as session:
-        query = session.query(GeneratedHaiku)
+        query = session.query(GeneratedHaiku).options(*_HAIKU_LOAD_OPTIONS)
 
         # Apply filters
         if server:
@@ -105,36 +177,51 @@ async def list_haikus(
         if username:
             query = query.filter(GeneratedHaiku.triggered_by == username)
         if search:
-            # Search in haiku text or ID
-            search_term = f"%{search}%"
-            query = query.filter(
-                (GeneratedHaiku.full_text.ilike(search_term)) |
-                (GeneratedHaiku.id == int(search) if search.isdigit() else False)
-            )
-        
-        # Order by most recent
-        query = query.order_by(desc(GeneratedHaiku.generated_at))
-        
-        # Pagination
-        haikus = query.offset(skip).limit(limit).all()
+            if search.isdigit():
+                # Numeric search is a haiku ID lookup
+                query = query.filter(GeneratedHaiku.id == int(search))
+            elif len(search) >= 3 and is_haiku_search_enabled():
+                # Trigram index needs at least 3 characters per term
+                phrase = '"' + search.replace('"', '""') + '"'
+                matches = text(
+                    "SELECT rowid FROM haiku_fts WHERE haiku_fts MATCH :phrase"
+                ).bindparams(phrase=phrase).columns(column("rowid"))
+                query = query.filter(GeneratedHaiku.id.in_(matches))
+            else:
+                query = query.filter(GeneratedHaiku.full_text.ilike(f"%{search}%"))
+        
+        # Order by most recent and seek past the cursor
+        query = _apply_keyset(query, GeneratedHaiku.generated_at, GeneratedHaiku.id, cursor)
+        if not cursor and skip:
+            query = query.offset(skip)
+
+        haikus = query.limit(limit).all()
+        _set_next_cursor(response, haikus, "generated_at", limit)
+        
+        return [HaikuResponse.model_validate(haiku) for haiku in haikus]
+
+
+@router.get("/haikus/random", response_model=HaikuResponse)
+async def get_random_haiku():
+    """Get a random generated haiku.
+    
+    Returns:
+        Random haiku
+    """
+    with get_session() as session:
+        # Seek to a random id instead of ORDER BY random(), which sorts the
+        # whole table; the next existing id is used when the pick hits a gap
+        max_id = session.query(func.max(GeneratedHaiku.id)).scalar()
+        haiku = None
+        if max_id:
+            haiku = session.query(GeneratedHaiku).options(*_HAIKU_LOAD_OPTIONS).filter(
+                GeneratedHaiku.id >= random.randint(1, max_id)
+            ).order_by(GeneratedHaiku.id).first()
         
-        # Build response with vote counts
-        results = []
-        for haiku in haikus:
-            results.append(HaikuResponse(
-                id=haiku.id,
-                full_text=haiku.full_text,
-                generated_at=haiku.generated_at,
-                triggered_by=haiku.triggered_by,
-                server=haiku.server,
-                channel=haiku.channel,
-                vote_count=len(haiku.votes),
-                line1=LineResponse.from_orm(haiku.line1),
-                line2=LineResponse.from_orm(haiku.line2),
-                line3=LineResponse.from_orm(haiku.line3)
-            ))
+        if not haiku:
+            raise HTTPException(status_code=404, detail="No haikus available")
         
-        return results
+        return HaikuResponse.model_validate(haiku)
 
 
 @router.get("/haikus/{haiku_id}", response_model=HaikuResponse)
@@ -148,50 +235,14 @@ async def get_haiku(haiku_id: int):
         Haiku details
     """
     with get_session() as session:
-        haiku = session.query(GeneratedHaiku).filter(GeneratedHaiku.id == haiku_id).first()
+        haiku = session.query(GeneratedHaiku).options(*_HAIKU_LOAD_OPTIONS).filter(
+            GeneratedHaiku.id == haiku_id
+        ).first()
         
         if not haiku:
             raise HTTPException(status_code=404, detail="Haiku not found")
         
-        return HaikuResponse(
-            id=haiku.id,
-            full_text=haiku.full_text,
-            generated_at=haiku.generated_at,
-            triggered_by=haiku.triggered_by,
-            server=haiku.server,
-            channel=haiku.channel,
-            vote_count=len(haiku.votes),
-            line1=LineResponse.from_orm(haiku.line1),
-            line2=LineResponse.from_orm(haiku.line2),
-            line3=LineResponse.from_orm(haiku.line3)
-        )
-
-
-@router.get("/haikus/random", response_model=HaikuResponse)
-async def get_random_haiku():
-    """Get a random generated haiku.
-    
-    Returns:
-        Random haiku
-    """
-    with get_session() as session:
-        haiku = session.query(GeneratedHaiku).order_by(func.random()).first()
-        
-        if not haiku:
-            raise HTTPException(status_code=404, detail="No haikus available")
-        
-        return HaikuResponse(
-            id=haiku.id,
-            full_text=haiku.full_text,
-            generated_at=haiku.generated_at,
-            triggered_by=haiku.triggered_by,
-            server=haiku.server,
-            channel=haiku.channel,
-            vote_count=len(haiku.votes),
-            line1=LineResponse.from_orm(haiku.line1),
-            line2=LineResponse.from_orm(haiku.line2),
-            line3=LineResponse.from_orm(haiku.line3)
-        )
+        return HaikuResponse.model_validate(haiku)
 
 
 class GenerateHaikuRequest(BaseModel):
@@ -211,6 +262,11 @@ async def generate_haiku_api(request: GenerateHaikuRequest):
     Returns:
         Newly generated haiku
     """
+    return await run_in_db_thread(_generate_haiku_response, request)
+
+
+def _generate_haiku_response(request: GenerateHaikuRequest) -> HaikuResponse:
+    """Generate a haiku and build its response (blocking database work)."""
     with get_session() as session:
         haiku = generate_haiku(
             session=session,
@@ -224,19 +280,13 @@ async def generate_haiku_api(request: GenerateHaikuRequest):
         
         if not haiku:
             raise HTTPException(status_code=400, detail="Not enough lines to generate haiku")
+
+        # Reload with its lines in one query instead of three lazy loads
+        haiku = session.query(GeneratedHaiku).options(*_HAIKU_LOAD_OPTIONS).filter(
+            GeneratedHaiku.id == haiku.id
+        ).one()
         
-        return HaikuResponse(
-            id=haiku.id,
-            full_text=haiku.full_text,
-            generated_at=haiku.generated_at,
-            triggered_by=haiku.triggered_by,
-            server=haiku.server,
-            channel=haiku.channel,
-            vote_count=0,
-            line1=LineResponse.from_orm(haiku.line1),
-            line2=LineResponse.from_orm(haiku.line2),
-            line3=LineResponse.from_orm(haiku.line3)
-        )
+        return HaikuResponse.model_validate(haiku)
 
 
 class VoteRequest(BaseModel):
@@ -256,33 +306,29 @@ async def vote_for_haiku(haiku_id: int, request: VoteRequest):
         Success message and vote count
     """
     with get_session() as session:
-        # Check if haiku exists
-        haiku = session.query(GeneratedHaiku).filter(GeneratedHaiku.id == haiku_id).first()
-        if not haiku:
+        # Bump the count first; no row back means the haiku doesn't exist
+        vote_count = session.execute(
+            update(GeneratedHaiku)
+            .where(GeneratedHaiku.id == haiku_id)
+            .values(vote_count=GeneratedHaiku.vote_count + 1)
+            .returning(GeneratedHaiku.vote_count)
+        ).scalar()
+        if vote_count is None:
             raise HTTPException(status_code=404, detail="Haiku not found")
         
-        # Check if already voted
-        existing = session.query(Vote).filter(
-            Vote.haiku_id == haiku_id,
-            Vote.username == request.username
+        # Add vote; uq_vote_haiku_user turns a second vote into a no-op
+        inserted = session.execute(
+            sqlite_insert(Vote)
+            .values(haiku_id=haiku_id, username=request.username)
+            .on_conflict_do_nothing(index_elements=['haiku_id', 'username'])
+            .returning(Vote.id)
         ).first()
-        
-        if existing:
+        if inserted is None:
+            session.rollback()
             raise HTTPException(status_code=400, detail="Already voted for this haiku")
         
-        # Add vote
-        vote = Vote(
-            haiku_id=haiku_id,
-            username=request.username,
-            voted_at=datetime.utcnow()
-        )
-        
-        session.add(vote)
         session.commit()
         
-        # Get updated vote count
-        vote_count = session.query(Vote).filter(Vote.haiku_id == haiku_id).count()
-        
         return {"message": "Vote recorded", "vote_count": vote_count}
 
 
@@ -293,6 +339,11 @@ async def get_stats():
     Returns:
         Statistics about lines and haikus
     """
+    return await run_in_db_thread(_stats_response)
+
+
+def _stats_response() -> StatsResponse:
+    """Compute global statistics (blocking database work)."""
     with get_session() as session:
         stats = get_haiku_stats(session)
         return StatsResponse(**stats)
@@ -300,16 +351,20 @@ async def get_stats():
 
 @router.get("/lines", response_model=List[LineResponse])
 async def list_lines(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
     syllable_count: Optional[int] = Query(None, ge=5, le=7),
     username: Optional[str] = None
 ):
     """List haiku lines with pagination and filters.
     
     Args:
-        skip: Number of records to skip
+        response: Outgoing response (used to set the next-page cursor)
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
+        cursor: Opaque cursor from a previous page
         syllable_count: Optional syllable count filter (5 or 7)
         username: Optional username filter
         
@@ -317,7 +372,7 @@ async def list_lines(
         List of lines
     """
     with get_session() as session:
-        query = session.query(Line)
+        query = session.query(*_LINE_RESPONSE_COLUMNS)
         
         # Apply filters
         if syllable_count:
@@ -325,13 +380,15 @@ async def list_lines(
         if username:
             query = query.filter(Line.username == username)
         
-        # Order by most recent
-        query = query.order_by(desc(Line.timestamp))
-        
-        # Pagination
-        lines = query.offset(skip).limit(limit).all()
+        # Order by most recent and seek past the cursor
+        query = _apply_keyset(query, Line.timestamp, Line.id, cursor)
+        if not cursor and skip:
+            query = query.offset(skip)
+
+        lines = query.limit(limit).all()
+        _set_next_cursor(response, lines, "timestamp", limit)
         
-        return [LineResponse.from_orm(line) for line in lines]
+        return [LineResponse.model_validate(line) for line in lines]
 
 
 @router.get("/users/{username}/stats", response_model=UserStatsResponse)
@@ -345,80 +402,87 @@ async def get_user_stats(username: str):
         User statistics
     """
     with get_session() as session:
-        user = session.query(User).filter(User.username == username).first()
-        
-        line_count = session.query(Line).filter(Line.username == username).count()
-        haiku_count = session.query(GeneratedHaiku).filter(GeneratedHaiku.triggered_by == username).count()
+        # Role and both counts as scalar subqueries in a single statement
+        role, line_count, haiku_count = session.query(
+            session.query(User.role).filter(User.username == username).scalar_subquery(),
+            session.query(func.count(Line.id)).filter(Line.username == username).scalar_subquery(),
+            session.query(func.count(GeneratedHaiku.id)).filter(
+                GeneratedHaiku.triggered_by == username
+            ).scalar_subquery(),
+        ).one()
         
         return UserStatsResponse(
             username=username,
             lines_contributed=line_count,
             haikus_generated=haiku_count,
-            role=user.role if user else "public"
+            role=role or "public"
         )
 
 
 @router.get("/users/{username}/lines", response_model=List[LineResponse])
 async def get_user_lines(
     username: str,
+    response: Response,
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
 ):
     """Get lines contributed by a specific user.
     
     Args:
         username: Username to look up
-        skip: Number of records to skip
+        response: Outgoing response (used to set the next-page cursor)
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
+        cursor: Opaque cursor from a previous page
         
     Returns:
         List of user's lines
     """
     with get_session() as session:
-        lines = session.query(Line).filter(
-            Line.username == username
-        ).order_by(desc(Line.timestamp)).offset(skip).limit(limit).all()
+        query = session.query(*_LINE_RESPONSE_COLUMNS).filter(Line.username == username)
+        query = _apply_keyset(query, Line.timestamp, Line.id, cursor)
+        if not cursor and skip:
+            query = query.offset(skip)
+
+        lines = query.limit(limit).all()
+        _set_next_cursor(response, lines, "timestamp", limit)
         
-        return [LineResponse.from_orm(line) for line in lines]
+        return [LineResponse.model_validate(line) for line in lines]
 
 
 @router.get("/users/{username}/haikus", response_model=List[HaikuResponse])
 async def get_user_haikus(
     username: str,
+    response: Response,
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None)
 ):
     """Get haikus generated by a specific user.
     
     Args:
         username: Username to look up
-        skip: Number of records to skip
+        response: Outgoing response (used to set the next-page cursor)
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
+        cursor: Opaque cursor from a previous page
         
     Returns:
         List of user's generated haikus
     """
     with get_session() as session:
-        haikus = session.query(GeneratedHaiku).filter(
+        query = session.query(GeneratedHaiku).options(*_HAIKU_LOAD_OPTIONS).filter(
             GeneratedHaiku.triggered_by == username
-        ).order_by(desc(GeneratedHaiku.generated_at)).offset(skip).limit(limit).all()
-        
-        results = []
-        for haiku in haikus:
-            results.append(HaikuResponse(
-                id=haiku.id,
-                full_text=haiku.full_text,
-                generated_at=haiku.generated_at,
-                triggered_by=haiku.triggered_by,
-                server=haiku.server,
-                channel=haiku.channel,
-                vote_count=len(haiku.votes),
-                line1=LineResponse.from_orm(haiku.line1),
-                line2=LineResponse.from_orm(haiku.line2),
-                line3=LineResponse.from_orm(haiku.line3)
-            ))
+        )
+        query = _apply_keyset(query, GeneratedHaiku.generated_at, GeneratedHaiku.id, cursor)
+        if not cursor and skip:
+            query = query.offset(skip)
+
+        haikus = query.limit(limit).all()
+        _set_next_cursor(response, haikus, "generated_at", limit)
         
-        return results
+        return [HaikuResponse.model_validate(haiku) for haiku in haikus]
 
 
 @router.get("/leaderboard")
@@ -432,10 +496,16 @@ async def get_leaderboard(limit: int = Query(10, ge=1, le=50)):
         List of users with contribution counts
     """
     with get_session() as session:
-        results = session.query(
-            Line.username,
-            func.count(Line.id).label('line_count')
-        ).group_by(Line.username).order_by(desc('line_count')).limit(limit).all()
+        if is_line_counts_enabled():
+            # Precomputed per-user totals, kept current by triggers on lines
+            results = session.query(
+                UserLineCount.username, UserLineCount.line_count
+            ).order_by(UserLineCount.line_count.desc()).limit(limit).all()
+        else:
+            results = session.query(
+                Line.username,
+                func.count(Line.id).label('line_count')
+            ).group_by(Line.username).order_by(desc('line_count')).limit(limit).all()
         
         leaderboard = []
         for username, count in results:
@@ -3,64 +3,169 @@
 import logging
 import asyncio
 import json
-from typing import Set
+from typing import Dict, Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 websocket_router = APIRouter()
 
+# Seconds to wait on a single client before treating it as dead
+SEND_TIMEOUT = 5.0
+
+# Messages buffered per client before it is considered too slow
+QUEUE_SIZE = 64
+
+
+# Serializer chosen once at import time: message dict -> UTF-8 JSON bytes
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+    def _dumps(message: dict) -> bytes:
+        """Serialize a message to JSON bytes with orjson."""
+        return orjson.dumps(message, option=_ORJSON_OPTIONS)
+else:
+    def _dumps(message: dict) -> bytes:
+        """Serialize a message to JSON bytes with the stdlib encoder."""
+        return json.dumps(message).encode()
+
 
 class ConnectionManager:
-    """Manages WebSocket connections."""
+    """Manages WebSocket connections.
+    
+    Each client gets a bounded outbound queue drained by its own writer
+    task, so producers never wait on a slow socket.
+    """
     
     def __init__(self):
         """Initialize connection manager."""
-        self.active_connections: Set[WebSocket] = set()
+        self.active_connections: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.listener_count = 0
     
     async def connect(self, websocket: WebSocket):
-        """Accept a new WebSocket connection.
+        """Accept a new WebSocket connection and start its writer.
         
         Args:
             websocket: WebSocket connection
         """
         await websocket.accept()
-        self.active_connections.add(websocket)
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.active_connections[websocket] = queue
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket, queue))
+        self.listener_count = len(self.active_connections)
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
-        """Remove a WebSocket connection.
+        """Remove a WebSocket connection and stop its writer.
         
         Args:
             websocket: WebSocket connection
         """
-        self.active_connections.discard(websocket)
+        if self.active_connections.pop(websocket, None) is None:
+            return
+        self.listener_count = len(self.active_connections)
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
+    def has_listeners(self) -> bool:
+        """Check whether any client is connected.
+        
+        Safe to call from IRC threads to skip building broadcast payloads.
+        
+        Returns:
+            True if at least one client is connected
+        """
+        return self.listener_count > 0
+    
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Send queued payloads to one client until it fails.
+        
+        Args:
+            websocket: WebSocket connection
+            queue: Outbound payload queue for this connection
+        """
+        while True:
+            payload = await queue.get()
+            try:
+                await asyncio.wait_for(websocket.send_bytes(payload), timeout=SEND_TIMEOUT)
+            except Exception as e:
+                logger.error(f"Error sending to WebSocket: {e!r}")
+                self.disconnect(websocket)
+                return
+    
+    def _enqueue(self, websocket: WebSocket, payload: bytes):
+        """Queue a payload for one client, dropping the client if it's backed up.
+        
+        Must run on the event loop that owns the connections.
+        """
+        queue = self.active_connections.get(websocket)
+        if queue is not None:
+            self._put(websocket, queue, payload)
+    
+    def _enqueue_all(self, payload: bytes):
+        """Queue a payload for every connected client."""
+        # Walk a snapshot of (socket, queue) pairs; no per-client hash lookups
+        for websocket, queue in list(self.active_connections.items()):
+            self._put(websocket, queue, payload)
+    
+    def _put(self, websocket: WebSocket, queue: asyncio.Queue, payload: bytes):
+        """Put a payload on a client's queue, dropping the client if it's full."""
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("WebSocket client too slow, disconnecting")
+            self.disconnect(websocket)
+            asyncio.ensure_future(websocket.close())
+    
+    def _call_on_loop(self, callback, *args):
+        """Run callback on the connections' event loop.
+        
+        IRC threads broadcast from their own event loops, and asyncio
+        queues are not thread-safe, so those calls are handed over.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        
+        if running is self._loop:
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
+    
+    async def broadcast_serialized(self, payload: bytes):
+        """Broadcast an already-serialized message to all connected clients.
+        
+        The same payload object is queued for every client.
+        
+        Args:
+            payload: UTF-8 encoded JSON message
+        """
+        if not self.has_listeners():
+            return
+        
+        self._call_on_loop(self._enqueue_all, payload)
+    
     async def broadcast(self, message: dict):
         """Broadcast a message to all connected clients.
         
         Args:
             message: Message dictionary to broadcast
         """
-        if not self.active_connections:
+        if not self.has_listeners():
             return
         
-        message_json = json.dumps(message)
-        
-        # Send to all connections, removing any that fail
-        disconnected = set()
-        
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message_json)
-            except Exception as e:
-                logger.error(f"Error broadcasting to WebSocket: {e}")
-                disconnected.add(connection)
-        
-        # Remove failed connections
-        for connection in disconnected:
-            self.disconnect(connection)
+        await self.broadcast_serialized(_dumps(message))
     
     async def send_personal(self, message: dict, websocket: WebSocket):
         """Send a message to a specific client.
@@ -69,11 +174,7 @@ class ConnectionManager:
             message: Message dictionary to send
             websocket: Target WebSocket connection
         """
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            logger.error(f"Error sending to WebSocket: {e}")
-            self.disconnect(websocket)
+        self._call_on_loop(self._enqueue, websocket, _dumps(message))
 
 
 # Global connection manager instance
@@ -85,7 +186,8 @@ async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for live haiku feed.
     
     Clients connect here to receive real-time notifications when
-    new haikus are generated.
+    new haikus are generated. Messages are sent as binary frames
+    containing UTF-8 JSON; clients send "ping" as a text frame.
     
     Args:
         websocket: WebSocket connection
@@ -127,12 +229,15 @@ async def broadcast_new_haiku(haiku_data: dict):
     Args:
         haiku_data: Dictionary with haiku information
     """
-    message = {
+    if not manager.has_listeners():
+        return
+    
+    payload = _dumps({
         "type": "new_haiku",
         "data": haiku_data
-    }
+    })
     
-    await manager.broadcast(message)
+    await manager.broadcast_serialized(payload)
 
 
 async def broadcast_new_line(line_data: dict):
@@ -141,12 +246,15 @@ async def broadcast_new_line(line_data: dict):
     Args:
         line_data: Dictionary with line information
     """
-    message = {
+    if not manager.has_listeners():
+        return
+    
+    payload = _dumps({
         "type": "new_line",
         "data": line_data
-    }
+    })
     
-    await manager.broadcast(message)
+    await manager.broadcast_serialized(payload)
 
 
 def get_connection_manager() -> ConnectionManager:
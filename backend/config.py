@@ -2,9 +2,14 @@
 
 import yaml
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml C bindings
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 class DatabaseConfig(BaseModel):
     """Database configuration."""
@@ -48,6 +53,8 @@ class AdminConfig(BaseModel):
     """Admin panel configuration."""
     username: str = "admin"
     password: str = "changeme"
+    secret_key: str = ""  # Signs admin tokens; random per process if empty
+    token_ttl_hours: int = 168
 
 
 class LoggingConfig(BaseModel):
@@ -67,6 +74,10 @@ class Config(BaseModel):
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
 
 
+# Parsed configs keyed by (resolved path, mtime)
+_config_cache: Dict[Tuple[str, int], Config] = {}
+
+
 def load_config(config_path: str = "config.yaml") -> Config:
     """Load configuration from YAML file.
     
@@ -88,13 +99,23 @@ def load_config(config_path: str = "config.yaml") -> Config:
             "Copy config.yaml.example to config.yaml and edit it."
         )
     
+    # Reuse the parsed config while the file is unchanged
+    cache_key = (str(path.resolve()), path.stat().st_mtime_ns)
+    cached = _config_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
     with open(path, 'r') as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_YamlLoader)
     
     try:
-        return Config(**data)
+        config = Config(**data)
     except Exception as e:
         raise ValueError(f"Invalid configuration: {e}")
+    
+    _config_cache.clear()
+    _config_cache[cache_key] = config
+    return config
 
 
 # Global config instance (loaded by main.py)
@@ -1,7 +1,10 @@
 """Database models and utilities."""
 
-from .models import Line, GeneratedHaiku, Vote, User, Server, Acronym
-from .db import init_db, get_db, get_session
+from .models import Line, GeneratedHaiku, Vote, User, Server, Acronym, UserLineCount
+from .db import (
+    init_db, get_db, get_session, run_in_db_thread,
+    is_haiku_search_enabled, is_line_counts_enabled,
+)
 
 __all__ = [
     "Line",
@@ -10,8 +13,12 @@ __all__ = [
     "User",
     "Server",
     "Acronym",
+    "UserLineCount",
     "init_db",
     "get_db",
     "get_session",
+    "run_in_db_thread",
+    "is_haiku_search_enabled",
+    "is_line_counts_enabled",
 ]
 
@@ -1,11 +1,18 @@
 """Database connection and session management."""
 
+import asyncio
+import functools
 import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Generator
-from sqlalchemy import create_engine, event
+from typing import Any, Callable, Generator
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from .models import Base
 
@@ -15,12 +22,83 @@ logger = logging.getLogger(__name__)
 _engine: Engine = None
 _SessionLocal: sessionmaker = None
 
+# Oldest SQLite supported: voting uses UPDATE/INSERT ... RETURNING (3.35+)
+_MIN_SQLITE_VERSION = (3, 35, 0)
+
+# Connection pool size for file-backed databases
+_POOL_SIZE = 20
+
+# Threads for running blocking database work from async code; matched to
+# the connection pool so workers don't queue waiting for a connection
+_db_executor = ThreadPoolExecutor(max_workers=_POOL_SIZE, thread_name_prefix="db")
+
+# Whether the haiku_fts full-text index is available (SQLite FTS5 trigram)
+_haiku_search_enabled: bool = False
+
+# External-content FTS5 index over generated_haikus.full_text. The trigram
+# tokenizer matches case-insensitive substrings, like ILIKE '%term%'.
+_HAIKU_FTS_DDL = [
+    """CREATE VIRTUAL TABLE haiku_fts USING fts5(
+        full_text, content='generated_haikus', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER haiku_fts_ai AFTER INSERT ON generated_haikus BEGIN
+        INSERT INTO haiku_fts(rowid, full_text) VALUES (new.id, new.full_text);
+    END""",
+    """CREATE TRIGGER haiku_fts_ad AFTER DELETE ON generated_haikus BEGIN
+        INSERT INTO haiku_fts(haiku_fts, rowid, full_text) VALUES ('delete', old.id, old.full_text);
+    END""",
+    """CREATE TRIGGER haiku_fts_au AFTER UPDATE OF full_text ON generated_haikus BEGIN
+        INSERT INTO haiku_fts(haiku_fts, rowid, full_text) VALUES ('delete', old.id, old.full_text);
+        INSERT INTO haiku_fts(rowid, full_text) VALUES (new.id, new.full_text);
+    END""",
+    "INSERT INTO haiku_fts(haiku_fts) VALUES ('rebuild')",
+]
+
+# Whether user_line_counts is maintained by triggers (used by the leaderboard)
+_line_counts_enabled: bool = False
+
+# Keep user_line_counts in step with the lines table on every write path
+_LINE_COUNTS_DDL = [
+    """CREATE TRIGGER user_line_counts_ai AFTER INSERT ON lines BEGIN
+        INSERT INTO user_line_counts(username, line_count) VALUES (new.username, 1)
+        ON CONFLICT(username) DO UPDATE SET line_count = line_count + 1;
+    END""",
+    """CREATE TRIGGER user_line_counts_ad AFTER DELETE ON lines BEGIN
+        UPDATE user_line_counts SET line_count = line_count - 1 WHERE username = old.username;
+        DELETE FROM user_line_counts WHERE username = old.username AND line_count <= 0;
+    END""",
+    """CREATE TRIGGER user_line_counts_au AFTER UPDATE OF username ON lines BEGIN
+        UPDATE user_line_counts SET line_count = line_count - 1 WHERE username = old.username;
+        DELETE FROM user_line_counts WHERE username = old.username AND line_count <= 0;
+        INSERT INTO user_line_counts(username, line_count) VALUES (new.username, 1)
+        ON CONFLICT(username) DO UPDATE SET line_count = line_count + 1;
+    END""",
+    "DELETE FROM user_line_counts",
+    """INSERT INTO user_line_counts(username, line_count)
+        SELECT username, COUNT(*) FROM lines GROUP BY username""",
+]
+
 
 @event.listens_for(Engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
-    """Enable foreign key constraints for SQLite."""
+    """Enable foreign key constraints and WAL tuning for SQLite.
+
+    WAL lets API readers proceed while the IRC threads write, and
+    synchronous=NORMAL is durable enough under WAL while avoiding an
+    fsync on every commit.
+    """
+    # Listener is registered on every Engine; skip non-SQLite connections
+    if not isinstance(dbapi_conn, sqlite3.Connection):
+        return
+
     cursor = dbapi_conn.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.execute("PRAGMA busy_timeout=5000")  # Wait up to 5s for a competing writer
     cursor.close()
 
 
@@ -29,27 +107,178 @@ def init_db(database_url: str) -> None:
     
     Args:
         database_url: SQLAlchemy database URL (e.g., 'sqlite:///haiku.db')
+
+    Raises:
+        RuntimeError: If the SQLite library is older than 3.35.0
     """
     global _engine, _SessionLocal
     
     logger.info(f"Initializing database: {database_url}")
+
+    if database_url.startswith("sqlite") and sqlite3.sqlite_version_info < _MIN_SQLITE_VERSION:
+        required = ".".join(map(str, _MIN_SQLITE_VERSION))
+        raise RuntimeError(
+            f"SQLite {sqlite3.sqlite_version} is too old; HaikuBot needs SQLite {required} "
+            f"or newer (for RETURNING). Upgrade SQLite or use a Python built against a newer one."
+        )
+    
+    if ":memory:" in database_url or database_url == "sqlite://":
+        # In-memory SQLite exists per connection, so share a single one
+        pool_options = {"poolclass": StaticPool}
+    else:
+        # Pool sized for concurrent API requests plus IRC threads; LIFO
+        # reuses warm connections and lets idle ones age out
+        pool_options = {
+            "poolclass": QueuePool,
+            "pool_size": _POOL_SIZE,
+            "max_overflow": 10,
+            "pool_pre_ping": True,
+            "pool_recycle": 3600,
+            "pool_use_lifo": True,
+        }
     
     # Create engine
     _engine = create_engine(
         database_url,
         connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
         echo=False,  # Set to True for SQL debug logging
+        **pool_options,
     )
     
     # Create session factory
     _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
     
+    # Tables present before create_all() won't get newly added indexes
+    existing_tables = set(inspect(_engine).get_table_names())
+
     # Create all tables
     Base.metadata.create_all(bind=_engine)
+
+    # Add columns introduced since an existing database was created
+    if "generated_haikus" in existing_tables:
+        _add_vote_count_column()
+
+    # Add any indexes introduced since an existing database was created.
+    # IF NOT EXISTS rather than checkfirst: SQLite can't reflect expression
+    # indexes, so checkfirst would try to recreate them.
+    with _engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
+    if database_url.startswith("sqlite"):
+        _init_haiku_search()
+        _init_line_counts()
     
+    logger.debug(f"Connection pool: {_engine.pool.status()}")
     logger.info("Database initialized successfully")
 
 
+def _add_vote_count_column() -> None:
+    """Add generated_haikus.vote_count to an older database and backfill it.
+
+    The column denormalizes COUNT(votes); databases created before it
+    existed get it filled in from the votes table once.
+    """
+    columns = {column["name"] for column in inspect(_engine).get_columns("generated_haikus")}
+    if "vote_count" in columns:
+        return
+
+    with _engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE generated_haikus ADD COLUMN vote_count INTEGER NOT NULL DEFAULT 0"
+        ))
+        conn.execute(text(
+            """UPDATE generated_haikus SET vote_count = (
+                SELECT COUNT(*) FROM votes WHERE votes.haiku_id = generated_haikus.id
+            )"""
+        ))
+    logger.info("Added and backfilled generated_haikus.vote_count")
+
+
+def _init_haiku_search() -> None:
+    """Create the haiku full-text index if it doesn't exist yet.
+
+    Requires SQLite 3.34+ (FTS5 trigram tokenizer); on older builds haiku
+    search falls back to ILIKE scans.
+    """
+    global _haiku_search_enabled
+
+    try:
+        with _engine.begin() as conn:
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name='haiku_fts'"
+            )).first()
+            if not exists:
+                for statement in _HAIKU_FTS_DDL:
+                    conn.execute(text(statement))
+                logger.info("Created haiku full-text search index")
+        _haiku_search_enabled = True
+    except OperationalError as e:
+        logger.warning(f"Haiku full-text search unavailable, using ILIKE: {e}")
+        _haiku_search_enabled = False
+
+
+def is_haiku_search_enabled() -> bool:
+    """Check whether the haiku_fts full-text index can be queried.
+
+    Returns:
+        True if haiku_fts exists and is maintained by triggers
+    """
+    return _haiku_search_enabled
+
+
+def _init_line_counts() -> None:
+    """Create the user_line_counts triggers and backfill if not done yet.
+
+    Requires SQLite 3.24+ (UPSERT); otherwise the leaderboard aggregates
+    the lines table directly.
+    """
+    global _line_counts_enabled
+
+    try:
+        with _engine.begin() as conn:
+            exists = conn.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='user_line_counts_ai'"
+            )).first()
+            if not exists:
+                for statement in _LINE_COUNTS_DDL:
+                    conn.execute(text(statement))
+                logger.info("Created user line count triggers")
+        _line_counts_enabled = True
+    except OperationalError as e:
+        logger.warning(f"User line counts unavailable, leaderboard will aggregate lines: {e}")
+        _line_counts_enabled = False
+
+
+def is_line_counts_enabled() -> bool:
+    """Check whether user_line_counts is being maintained.
+
+    Returns:
+        True if user_line_counts is kept current by triggers
+    """
+    return _line_counts_enabled
+
+
+async def run_in_db_thread(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking database work on the database thread pool.
+
+    Keeps synchronous SQLAlchemy calls from blocking the event loop.
+
+    Args:
+        func: Function to call (should open its own session)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, functools.partial(func, *args, **kwargs))
+
+
 def get_db() -> Engine:
     """Get the database engine.
     
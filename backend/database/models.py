@@ -35,9 +35,27 @@ class Line(Base):
     # Indexes for query performance
     __table_args__ = (
         UniqueConstraint('text', name='uq_line_text', sqlite_on_conflict='IGNORE'),
+        # Case-insensitive duplicate check: filter on func.lower(Line.text)
+        Index('idx_lines_text_lower', func.lower(text)),
         Index('idx_syllable_placement', 'syllable_count', 'placement'),
         Index('idx_server_channel', 'server', 'channel'),
         Index('idx_username', 'username'),
+        # Covers haiku line picking (equality columns first, then optional filters)
+        Index(
+            'idx_lines_pick', 'syllable_count', 'approved', 'flagged_for_deletion',
+            'placement', 'username', 'channel', 'server', 'source'
+        ),
+        # Keyset pagination (newest first)
+        Index('idx_lines_ts_id', timestamp.desc(), id.desc()),
+        # Per-user listing; carries every LineResponse column so the page is
+        # read from the index alone (also serves the keyset seek)
+        Index(
+            'idx_lines_user_cover', 'username', timestamp.desc(), id.desc(),
+            'text', 'syllable_count', 'placement', 'server', 'channel', 'source'
+        ),
+        # Partial index for the admin syllable check (unvalidated lines only).
+        # Queries must filter with human_validated.is_(False) to match it.
+        Index('idx_lines_unvalidated_ts', 'timestamp', sqlite_where=human_validated.is_(False)),
     )
     
     def __repr__(self):
@@ -60,6 +78,7 @@ class GeneratedHaiku(Base):
     triggered_by = Column(String(100), nullable=False)
     server = Column(String(100), nullable=False)
     channel = Column(String(100), nullable=False)
+    vote_count = Column(Integer, nullable=False, default=0, server_default='0')  # Denormalized, kept in step with votes
     
     # Relationships
     line1 = relationship("Line", foreign_keys=[line1_id])
@@ -71,15 +90,13 @@ class GeneratedHaiku(Base):
     __table_args__ = (
         Index('idx_generated_at', 'generated_at'),
         Index('idx_triggered_by', 'triggered_by'),
+        # Keyset pagination (newest first)
+        Index('idx_haikus_generated_id', generated_at.desc(), id.desc()),
+        Index('idx_haikus_user_generated_id', 'triggered_by', generated_at.desc(), id.desc()),
     )
     
     def __repr__(self):
         return f"<GeneratedHaiku(id={self.id}, text='{self.full_text[:40]}...')>"
-    
-    @property
-    def vote_count(self):
-        """Get the number of votes for this haiku."""
-        return len(self.votes)
 
 
 class Vote(Base):
@@ -92,7 +109,7 @@ class Vote(Base):
     id = Column(Integer, primary_key=True)
     haiku_id = Column(Integer, ForeignKey('generated_haikus.id'), nullable=False)
     username = Column(String(100), nullable=False)
-    voted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    voted_at = Column(DateTime, nullable=False, default=func.now(), server_default=func.now())  # Stamped by the database
     
     # Relationship
     haiku = relationship("GeneratedHaiku", back_populates="votes")
@@ -182,3 +199,22 @@ class Acronym(Base):
     def __repr__(self):
         return f"<Acronym(acronym='{self.acronym}', syllables={self.syllable_count})>"
 
+
+class UserLineCount(Base):
+    """Per-user line totals backing the leaderboard.
+
+    Maintained by SQLite triggers on the lines table (see db.py), so it
+    never needs to be written from application code.
+    """
+    __tablename__ = "user_line_counts"
+
+    username = Column(String(100), primary_key=True)
+    line_count = Column(Integer, nullable=False, default=0)
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_leaderboard', line_count.desc()),
+    )
+
+    def __repr__(self):
+        return f"<UserLineCount(username='{self.username}', lines={self.line_count})>"
@@ -1,11 +1,18 @@
 """Haiku logic: syllable counting and generation."""
 
-from .syllable_counter import count_syllables, validate_line_for_auto_collection
+from .syllable_counter import (
+    count_syllables,
+    exceeds_syllables,
+    validate_line_for_auto_collection,
+    warm_up,
+)
 from .generator import generate_haiku, generate_haiku_for_user, generate_haiku_for_channel, get_haiku_stats
 
 __all__ = [
     "count_syllables",
+    "exceeds_syllables",
     "validate_line_for_auto_collection",
+    "warm_up",
     "generate_haiku",
     "generate_haiku_for_user",
     "generate_haiku_for_channel",
@@ -1,15 +1,47 @@
 """Haiku generation logic with placement awareness."""
 
 import logging
-import random
 from typing import Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, exists, func, literal, select, union_all
 
 from ..database.models import Line, GeneratedHaiku
 
 logger = logging.getLogger(__name__)
 
+# Candidate filters that never change between calls
+_USABLE_LINE = (Line.approved == True, Line.flagged_for_deletion == False)
+_FILTERS_5_FIRST = (
+    Line.syllable_count == 5, *_USABLE_LINE,
+    or_(Line.placement == None, Line.placement.in_(['any', 'first'])),
+)
+_FILTERS_7 = (Line.syllable_count == 7, *_USABLE_LINE)
+_FILTERS_5_LAST = (
+    Line.syllable_count == 5, *_USABLE_LINE,
+    or_(Line.placement == None, Line.placement.in_(['any', 'last'])),
+)
+
+
+def _random_ids(slot: int, filters: list, limit: int):
+    """Build a SELECT of up to `limit` random matching line IDs tagged with `slot`.
+
+    Args:
+        slot: Haiku position the IDs are for (1, 2 or 3)
+        filters: Filter expressions the line must match
+        limit: Number of IDs to pick
+
+    Returns:
+        Select yielding (slot, id) rows
+    """
+    picked = (
+        select(Line.id)
+        .where(and_(*filters))
+        .order_by(func.random())
+        .limit(limit)
+        .subquery()
+    )
+    return select(literal(slot).label("slot"), picked.c.id)
+
 
 def generate_haiku(
     session: Session,
@@ -41,73 +73,68 @@ def generate_haiku(
     Returns:
         GeneratedHaiku object or None if insufficient lines
     """
-    # Build base query filters
-    filters_5_first = [Line.syllable_count == 5, Line.approved == True, Line.flagged_for_deletion == False]
-    filters_7 = [Line.syllable_count == 7, Line.approved == True, Line.flagged_for_deletion == False]
-    filters_5_last = [Line.syllable_count == 5, Line.approved == True, Line.flagged_for_deletion == False]
-    
-    # Add placement restrictions
-    filters_5_first.append(or_(Line.placement == None, Line.placement.in_(['any', 'first'])))
-    filters_5_last.append(or_(Line.placement == None, Line.placement.in_(['any', 'last'])))
-    
-    # Apply optional filters
+    # Optional filters shared by all three positions
+    extra_filters = []
     if username_filter:
-        filters_5_first.append(Line.username == username_filter)
-        filters_7.append(Line.username == username_filter)
-        filters_5_last.append(Line.username == username_filter)
-    
+        extra_filters.append(Line.username == username_filter)
     if channel_filter:
-        filters_5_first.append(Line.channel == channel_filter)
-        filters_7.append(Line.channel == channel_filter)
-        filters_5_last.append(Line.channel == channel_filter)
-    
+        extra_filters.append(Line.channel == channel_filter)
     if server_filter:
-        filters_5_first.append(Line.server == server_filter)
-        filters_7.append(Line.server == server_filter)
-        filters_5_last.append(Line.server == server_filter)
-
+        extra_filters.append(Line.server == server_filter)
     if source_filter:
-        filters_5_first.append(Line.source == source_filter)
-        filters_7.append(Line.source == source_filter)
-        filters_5_last.append(Line.source == source_filter)
-
-    # Query for available lines
-    line1_candidates = session.query(Line).filter(and_(*filters_5_first)).all()
-    line2_candidates = session.query(Line).filter(and_(*filters_7)).all()
-    line3_candidates = session.query(Line).filter(and_(*filters_5_last)).all()
-    
-    # Log counts
-    logger.info(f"Line candidates: 1st={len(line1_candidates)}, "
-                f"2nd={len(line2_candidates)}, 3rd={len(line3_candidates)}")
+        extra_filters.append(Line.source == source_filter)
+
+    # Fixed filters (base + placement restrictions) are built once at import
+    filters_5_first = [*_FILTERS_5_FIRST, *extra_filters]
+    filters_7 = [*_FILTERS_7, *extra_filters]
+    filters_5_last = [*_FILTERS_5_LAST, *extra_filters]
+
+    # Restrictive filters (e.g. a rarely-heard user) often leave a position
+    # empty; check all three with one EXISTS query before picking at random
+    if extra_filters:
+        has_1, has_2, has_3 = session.execute(select(
+            exists().where(*filters_5_first),
+            exists().where(*filters_7),
+            exists().where(*filters_5_last),
+        )).one()
+        if not (has_1 and has_2 and has_3):
+            missing = [pos for pos, ok in ((1, has_1), (2, has_2), (3, has_3)) if not ok]
+            logger.warning(f"No valid lines for position(s) {missing} with the given filters")
+            return None
+
+    # Let SQLite pick every position in one round-trip. Position 3 gets two
+    # candidates so one can differ from line 1 whenever that's possible.
+    picks = {1: [], 2: [], 3: []}
+    for slot, line_id in session.execute(union_all(
+        _random_ids(1, filters_5_first, 1),
+        _random_ids(2, filters_7, 1),
+        _random_ids(3, filters_5_last, 2),
+    )):
+        picks[slot].append(line_id)
     
     # Check if we have enough lines
-    if not line1_candidates:
+    if not picks[1]:
         logger.warning("No valid 5-syllable lines for position 1")
         return None
-    if not line2_candidates:
+    if not picks[2]:
         logger.warning("No valid 7-syllable lines for position 2")
         return None
-    if not line3_candidates:
+    if not picks[3]:
         logger.warning("No valid 5-syllable lines for position 3")
         return None
     
-    # Randomly select lines
-    line1 = random.choice(line1_candidates)
-    line2 = random.choice(line2_candidates)
+    line1_id = picks[1][0]
+    line2_id = picks[2][0]
 
     # Ensure line3 is different from line1 (avoid duplicate 5-syllable lines)
-    line3_candidates_filtered = [line for line in line3_candidates if line.id != line1.id]
+    line3_id = next((line_id for line_id in picks[3] if line_id != line1_id), picks[3][0])
 
-    # If filtering removed all candidates and we have more than one candidate total, retry
-    if not line3_candidates_filtered and len(line3_candidates) > 1:
-        # This shouldn't happen, but fallback to original list
-        line3_candidates_filtered = line3_candidates
-    elif not line3_candidates_filtered:
-        # Only one 5-syllable line available, must use it even if duplicate
-        logger.warning(f"Only one 5-syllable line available, allowing duplicate")
-        line3_candidates_filtered = line3_candidates
-
-    line3 = random.choice(line3_candidates_filtered)
+    # Load the chosen lines in one query
+    lines = {
+        line.id: line
+        for line in session.query(Line).filter(Line.id.in_({line1_id, line2_id, line3_id}))
+    }
+    line1, line2, line3 = lines[line1_id], lines[line2_id], lines[line3_id]
 
     # Log if we ended up with duplicate despite filtering
     if line1.id == line3.id:
@@ -206,24 +233,21 @@ def get_haiku_stats(session: Session) -> dict:
     Returns:
         Dictionary with statistics
     """
-    # Count 5-syllable lines by placement
-    lines_5_any = session.query(Line).filter(
-        Line.syllable_count == 5,
-        or_(Line.placement == None, Line.placement == 'any')
-    ).count()
-    
-    lines_5_first = session.query(Line).filter(
-        Line.syllable_count == 5,
-        Line.placement == 'first'
-    ).count()
+    # Count lines per (syllable_count, placement) in a single pass
+    counts = {
+        (syllables, placement): count
+        for syllables, placement, count in session.query(
+            Line.syllable_count, Line.placement, func.count()
+        ).group_by(Line.syllable_count, Line.placement)
+    }
     
-    lines_5_last = session.query(Line).filter(
-        Line.syllable_count == 5,
-        Line.placement == 'last'
-    ).count()
+    # Count 5-syllable lines by placement
+    lines_5_any = counts.get((5, None), 0) + counts.get((5, 'any'), 0)
+    lines_5_first = counts.get((5, 'first'), 0)
+    lines_5_last = counts.get((5, 'last'), 0)
     
     # Count 7-syllable lines
-    lines_7 = session.query(Line).filter(Line.syllable_count == 7).count()
+    lines_7 = sum(count for (syllables, _), count in counts.items() if syllables == 7)
     
     # Calculate valid line counts for each position
     lines_pos1 = lines_5_any + lines_5_first  # Can use 'any' or 'first'
@@ -1,6 +1,8 @@
 #!/usr/bin/env perl
 # Simple Perl syllable counter using Lingua::EN::Syllable
 # Usage: perl perl_syllable_counter.pl "text to count"
+#        perl perl_syllable_counter.pl --stdin < texts.txt   (one count per input line)
+#        (--stdin is also used as a long-lived coprocess by syllable_counter.py)
 
 use strict;
 use warnings;
@@ -8,19 +10,34 @@ use FindBin qw($RealBin);
 use lib "$RealBin/../../Lingua-EN-Syllable-0.31/lib";
 use Lingua::EN::Syllable;
 
-# Get text from command line argument
-my $text = $ARGV[0] || '';
+sub count_text {
+    my ($text) = @_;
 
-# Remove punctuation, split on spaces and hyphens
-$text =~ s/[^\w\s\-']//g;
-my @words = split /[\s\-]+/, $text;
+    # Remove punctuation, split on spaces and hyphens
+    $text =~ s/[^\w\s\-']//g;
+    my @words = split /[\s\-]+/, $text;
 
-my $total = 0;
-for my $word (@words) {
-    next unless $word;
-    my $count = Lingua::EN::Syllable::syllable($word);
-    $total += $count;
+    my $total = 0;
+    for my $word (@words) {
+        next unless $word;
+        my $count = Lingua::EN::Syllable::syllable($word);
+        $total += $count;
+    }
+    return $total;
 }
 
-# Print just the number (for easy parsing)
-print $total;
+if (@ARGV && $ARGV[0] eq '--stdin') {
+    # Batch/coprocess mode: one text per line in, one count per line out.
+    # Flush after every count so a long-lived caller can read it right away.
+    $| = 1;
+    while (my $line = <STDIN>) {
+        chomp $line;
+        print count_text($line), "\n";
+    }
+} else {
+    # Get text from command line argument
+    my $text = $ARGV[0] || '';
+
+    # Print just the number (for easy parsing)
+    print count_text($text);
+}
@@ -1,18 +1,35 @@
-"""Syllable counting using multiple methods with voting for accuracy."""
+"""Syllable counting using Perl with Python library fallbacks."""
 
 import re
 import logging
-import subprocess
 import os
+import select
+import subprocess
+import threading
 from pathlib import Path
-from typing import Optional, List
-from collections import Counter
+from typing import Optional, List, Tuple
+from functools import lru_cache
 import pyphen
 from syllables import estimate as syllables_estimate
 import pronouncing
 
 logger = logging.getLogger(__name__)
 
+# Punctuation to strip (keeps letters, digits, spaces, hyphens, apostrophes)
+_PUNCT_RE = re.compile(r"[^\w\s\-']")
+
+# Same deletion as _PUNCT_RE for ASCII text, done by str.translate in C
+_PUNCT_TABLE = str.maketrans('', '', ''.join(
+    chr(i) for i in range(128) if _PUNCT_RE.match(chr(i))
+))
+
+# Vowel runs and vowel set for the heuristic counter
+_VOWEL_GROUP_RE = re.compile(r'[aeiouy]+')
+_VOWELS = frozenset('aeiouy')
+
+# A letter or digit; tokens without one (a bare ' or _) may count as zero
+_ALNUM_RE = re.compile(r'[^\W_]')
+
 # Path to Perl syllable counter script
 _PERL_SCRIPT_PATH = Path(__file__).parent / "perl_syllable_counter.pl"
 
@@ -22,12 +39,45 @@ _hyphenator = pyphen.Pyphen(lang='en_US')
 # Acronym cache - loaded on first use
 _acronym_cache: Optional[dict] = None
 
+# CMU word -> syllable count table - built on first use
+_cmu_syllables: Optional[dict] = None
+_cmu_lock = threading.Lock()
+
+# Largest word batch sent through the Perl coprocess in one round-trip
+_PERL_COPROCESS_BATCH_MAX = 500
+
+# Per-word Perl results. Only successful counts are stored so a transient
+# subprocess failure is retried on the next occurrence of the word.
+_perl_word_cache: dict = {}
+_PERL_WORD_CACHE_MAX = 50000
+
+# Whole-text Perl results, with the same successes-only rule
+_perl_text_cache: dict = {}
+_PERL_TEXT_CACHE_MAX = 50000
+
+
+def _strip_punctuation(text: str) -> str:
+    """Remove punctuation, keeping letters, digits, spaces, hyphens and apostrophes.
+
+    Args:
+        text: Text to clean
+
+    Returns:
+        Text with punctuation removed
+    """
+    if text.isascii():
+        return text.translate(_PUNCT_TABLE)
+    return _PUNCT_RE.sub('', text)
+
 
 def _load_acronym_cache() -> dict:
     """Load acronyms from database into memory cache.
 
+    Loaded once on first use (the database isn't initialized at import
+    time); callers fetch the dict once per text and look words up directly.
+
     Returns:
-        Dictionary mapping acronym to syllable count
+        Dictionary mapping lowercase acronym to syllable count
     """
     global _acronym_cache
 
@@ -40,9 +90,8 @@ def _load_acronym_cache() -> dict:
         from ..database import get_session, Acronym
 
         with get_session() as session:
-            acronyms = session.query(Acronym).all()
-            for acronym in acronyms:
-                _acronym_cache[acronym.acronym.lower()] = acronym.syllable_count
+            rows = session.query(Acronym.acronym, Acronym.syllable_count)
+            _acronym_cache = {acronym.lower(): count for acronym, count in rows}
 
         logger.info(f"Loaded {len(_acronym_cache)} acronyms into cache")
     except Exception as e:
@@ -52,19 +101,19 @@ def _load_acronym_cache() -> dict:
     return _acronym_cache
 
 
-def _check_acronym(word: str) -> int:
-    """Check if word is a known acronym and return syllable count.
+def warm_up():
+    """Load syllable counting dictionaries ahead of the first request.
 
-    Args:
-        word: Single word to check
-
-    Returns:
-        Syllable count if found in acronym database, 0 otherwise
+    Forces the pyphen patterns, CMU table and acronym cache to load during
+    startup so the first line or haiku isn't stalled by them. Call after
+    the database is initialized.
     """
-    cache = _load_acronym_cache()
-    return cache.get(word.lower(), 0)
+    _hyphenator.positions('hello')
+    _load_cmu()
+    _load_acronym_cache()
 
 
+@lru_cache(maxsize=4096)
 def _split_camelcase(word: str) -> List[str]:
     """Split CamelCase word into separate words.
 
@@ -77,29 +126,140 @@ def _split_camelcase(word: str) -> List[str]:
         word: Word that might be in CamelCase
 
     Returns:
-        List of words after splitting
+        List of words after splitting (cached; do not modify)
     """
-    # Match pattern: lowercase followed by uppercase, or uppercase followed by uppercase+lowercase
-    # This handles both "evilB" and "EvilB" and "XMLParser" patterns
-    parts = re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z][a-z]|\b)', word)
+    # Lowercase, all-caps and Capitalized words can't be CamelCase (no
+    # uppercase after the first letter)
+    if (len(word) < 2 or word.islower() or word.isupper()
+            or not any(c.isupper() for c in word[1:])):
+        return [word]
+
+    # Only plain ASCII-letter words are split; anything with digits,
+    # apostrophes or accents is counted whole
+    if not (word.isascii() and word.isalpha()):
+        return [word]
 
-    if not parts:
+    # Start a new part at an uppercase letter that follows a lowercase one
+    # ("evilB") or begins a capitalized run ("XMLParser" -> "XML", "Parser")
+    parts = []
+    start = 0
+    for i in range(1, len(word)):
+        if word[i].isupper() and (
+            word[i - 1].islower() or (i + 1 < len(word) and word[i + 1].islower())
+        ):
+            parts.append(word[start:i])
+            start = i
+    parts.append(word[start:])
+
+    if len(parts) < 2:
         # No CamelCase detected, return original word
         return [word]
 
-    # Check if we actually split anything
-    joined = ''.join(parts)
-    if joined.lower() == word.lower() and len(parts) > 1:
-        # Successfully split CamelCase
-        logger.debug(f"Split CamelCase: '{word}' -> {parts}")
-        return parts
+    logger.debug(f"Split CamelCase: '{word}' -> {parts}")
+    return parts
 
-    # No split occurred, return original
-    return [word]
+
+class _PerlWorker:
+    """Long-lived Perl coprocess running the counter script in --stdin mode.
+
+    Keeps one interpreter (with Lingua::EN::Syllable loaded) alive for the
+    bot's lifetime so a count costs a pipe round-trip instead of a
+    fork/exec and Perl startup. The process is restarted on the next call
+    after any failure.
+    """
+
+    def __init__(self, timeout: float = 5.0):
+        """Initialize worker; the process is started on first use.
+
+        Args:
+            timeout: Seconds to wait for a count before killing the process
+        """
+        self.timeout = timeout
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        """Spawn the Perl process."""
+        self._proc = subprocess.Popen(
+            ['perl', str(_PERL_SCRIPT_PATH), '--stdin'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def _stop(self):
+        """Kill the Perl process, if any."""
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+    def count_many(self, texts: List[str]) -> List[int]:
+        """Count syllables in several texts with one round-trip.
+
+        Meant for message-sized batches: all texts are written before any
+        counts are read, so very large batches should use
+        _count_syllables_perl_batch() instead.
+
+        Args:
+            texts: Texts to count syllables in
+
+        Returns:
+            Syllable count reported by Perl per text, in order
+
+        Raises:
+            FileNotFoundError: If perl is not installed
+            subprocess.TimeoutExpired: If Perl doesn't answer in time
+            OSError, ValueError: If the process died or answered garbage
+        """
+        if not texts:
+            return []
+
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+
+            try:
+                payload = ''.join(text.replace('\n', ' ') + '\n' for text in texts)
+                self._proc.stdin.write(payload.encode())
+                self._proc.stdin.flush()
+
+                # Read the raw pipe directly so select() sees every unread byte
+                fd = self._proc.stdout.fileno()
+                output = b''
+                while output.count(b'\n') < len(texts):
+                    ready, _, _ = select.select([fd], [], [], self.timeout)
+                    if not ready:
+                        raise subprocess.TimeoutExpired(self._proc.args, self.timeout)
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        raise BrokenPipeError("Perl syllable counter exited")
+                    output += chunk
+
+                counts = [int(value) for value in output.split()]
+                if len(counts) != len(texts):
+                    raise ValueError(f"Perl returned {len(counts)} counts for {len(texts)} texts")
+                return counts
+            except Exception:
+                self._stop()
+                raise
+
+    def count(self, text: str) -> int:
+        """Count syllables in one text.
+
+        Args:
+            text: Text to count syllables in
+
+        Returns:
+            Syllable count reported by Perl
+        """
+        return self.count_many([text])[0]
+
+
+_perl_worker = _PerlWorker()
 
 
 def _count_syllables_perl(text: str) -> int:
-    """Count syllables using Perl Lingua::EN::Syllable via subprocess.
+    """Count syllables using Perl Lingua::EN::Syllable via a persistent coprocess.
 
     This is the most accurate method (78% on test data) and likely matches
     the original Perl bot's behavior.
@@ -110,26 +270,95 @@ def _count_syllables_perl(text: str) -> int:
     Returns:
         Syllable count (0 if Perl script fails)
     """
+    try:
+        return _perl_worker.count(text)
+    except FileNotFoundError:
+        logger.warning("Perl not found - falling back to Python methods")
+        return 0
+    except (subprocess.SubprocessError, OSError, ValueError) as e:
+        logger.warning(f"Perl syllable counter error: {e!r}")
+        return 0
+
+
+def _count_syllables_perl_many(texts: List[str]) -> List[int]:
+    """Count syllables for a few texts with one coprocess round-trip.
+
+    Args:
+        texts: Texts to count (a message's worth of words)
+
+    Returns:
+        Syllable count per text, in order (all 0 if Perl fails)
+    """
+    try:
+        return _perl_worker.count_many(texts)
+    except FileNotFoundError:
+        logger.warning("Perl not found - falling back to Python methods")
+    except (subprocess.SubprocessError, OSError, ValueError) as e:
+        logger.warning(f"Perl syllable counter error: {e!r}")
+    return [0] * len(texts)
+
+
+def _perl_words(text: str, acronyms: dict) -> List[str]:
+    """List the words of a text that need a Perl count.
+
+    Known acronyms are skipped and numbers are spelled out, exactly as
+    _count_syllables_perl_word_by_word() will look them up.
+
+    Args:
+        text: Text to split
+        acronyms: Acronym cache
+
+    Returns:
+        Words to count with Perl
+    """
+    words = []
+    for word in _strip_punctuation(text).replace('-', ' ').split():
+        if acronyms.get(word.lower(), 0) > 0:
+            continue
+        if word.isdigit():
+            word = _convert_number_to_words(word) or word
+        words.append(word)
+    return words
+
+
+def _count_syllables_perl_batch(texts: List[str]) -> List[int]:
+    """Count syllables for many texts with a single Perl subprocess.
+
+    Texts are sent newline-delimited over stdin and one count is read back
+    per line, so the fork/exec cost is paid once instead of per text.
+
+    Args:
+        texts: Texts to count (must not contain newlines)
+
+    Returns:
+        Syllable count per text, in order (all 0 if Perl script fails)
+    """
+    if not texts:
+        return []
+
     try:
         result = subprocess.run(
-            ['perl', str(_PERL_SCRIPT_PATH), text],
+            ['perl', str(_PERL_SCRIPT_PATH), '--stdin'],
+            input='\n'.join(texts) + '\n',
             capture_output=True,
             text=True,
-            timeout=5,  # 5 second timeout
+            timeout=5 + len(texts) // 1000,
         )
 
         if result.returncode == 0:
-            return int(result.stdout.strip())
+            counts = [int(value) for value in result.stdout.split()]
+            if len(counts) == len(texts):
+                return counts
+            logger.warning(f"Perl batch returned {len(counts)} counts for {len(texts)} texts")
         else:
             logger.warning(f"Perl script failed: {result.stderr}")
-            return 0
 
     except (subprocess.TimeoutExpired, subprocess.SubprocessError, ValueError) as e:
         logger.warning(f"Perl syllable counter error: {e}")
-        return 0
     except FileNotFoundError:
         logger.warning("Perl not found - falling back to Python methods")
-        return 0
+
+    return [0] * len(texts)
 
 
 def _convert_number_to_words(word: str) -> Optional[str]:
@@ -153,7 +382,11 @@ def _convert_number_to_words(word: str) -> Optional[str]:
         return None
 
 
-def _count_syllables_perl_word_by_word(text: str) -> int:
+def _count_syllables_perl_word_by_word(
+    text: str,
+    perl_counts: Optional[dict] = None,
+    limit: Optional[int] = None
+) -> int:
     """Count syllables word-by-word: check acronyms first, then convert numbers, then call Perl.
 
     This ensures that:
@@ -163,25 +396,45 @@ def _count_syllables_perl_word_by_word(text: str) -> int:
 
     Args:
         text: Text to count syllables in
+        perl_counts: Optional precomputed Perl counts by word (from a batch run)
+        limit: Optional count to stop at; once the running total exceeds it
+            the partial total is returned without counting remaining words,
+            and only the first limit + 1 words are sent to Perl up front
 
     Returns:
-        Total syllable count
+        Total syllable count (or a partial total above limit)
     """
     if not text or not text.strip():
         return 0
 
     # Clean and split text into words (remove punctuation but keep apostrophes, split on spaces/hyphens)
-    cleaned = re.sub(r"[^\w\s\-']", '', text)
-    words = re.split(r'[\s\-]+', cleaned)
+    cleaned = _strip_punctuation(text)
+    words = cleaned.replace('-', ' ').split()
+    acronyms = _load_acronym_cache()
+
+    # Count every uncached word of the message in one Perl round-trip. With
+    # a limit, words past the first limit + 1 almost never matter (each has
+    # at least one syllable), so they're left to the per-word fallback.
+    if perl_counts is None:
+        needed = _perl_words(cleaned, acronyms)
+        if limit is not None:
+            needed = needed[:limit + 1]
+        missing = list({word for word in needed if word not in _perl_word_cache})
+        perl_counts = dict(zip(missing, _count_syllables_perl_many(missing)))
+        for word, count in perl_counts.items():
+            if count > 0:
+                if len(_perl_word_cache) >= _PERL_WORD_CACHE_MAX:
+                    _perl_word_cache.clear()
+                _perl_word_cache[word] = count
 
     total = 0
 
     for word in words:
-        if not word:
-            continue
+        if limit is not None and total > limit:
+            break
 
         # Priority 1: Check if word is a known acronym
-        acronym_count = _check_acronym(word.lower())
+        acronym_count = acronyms.get(word.lower(), 0)
         if acronym_count > 0:
             total += acronym_count
             logger.debug(f"Word: '{word}' -> acronym={acronym_count}")
@@ -194,8 +447,17 @@ def _count_syllables_perl_word_by_word(text: str) -> int:
                 logger.debug(f"Number: '{word}' -> '{word_text}'")
                 word = word_text
 
-        # Priority 3: Call Perl for the word (or converted number text)
-        perl_count = _count_syllables_perl(word)
+        # Priority 3: Call Perl for the word (or converted number text),
+        # reusing earlier results since vocabulary repeats heavily across lines
+        perl_count = perl_counts.get(word) if perl_counts else None
+        if perl_count is None:
+            perl_count = _perl_word_cache.get(word)
+        if perl_count is None:
+            perl_count = _count_syllables_perl(word)
+            if perl_count > 0:
+                if len(_perl_word_cache) >= _PERL_WORD_CACHE_MAX:
+                    _perl_word_cache.clear()
+                _perl_word_cache[word] = perl_count
         total += perl_count
         logger.debug(f"Word: '{word}' -> perl={perl_count}")
 
@@ -205,9 +467,14 @@ def _count_syllables_perl_word_by_word(text: str) -> int:
 def count_syllables(text: str, method: str = "perl") -> int:
     """Count syllables in text using selected method.
 
+    Results are cached by stripped text, so a line that recurs in chat is
+    a single lookup. Case is kept in the key because it drives CamelCase
+    splitting. Perl counts are only cached when Perl succeeded, so a
+    transient failure isn't remembered as the Python fallback's count.
+
     Methods:
     - "perl": Use Lingua::EN::Syllable via Perl subprocess (78% accuracy, most accurate)
-    - "python": Use Python syllables library (64% accuracy, pure Python)
+    - "python": Use CMU dictionary, then pyphen, then the syllables library (pure Python)
 
     Args:
         text: Text to count syllables in
@@ -216,92 +483,196 @@ def count_syllables(text: str, method: str = "perl") -> int:
     Returns:
         Total syllable count
     """
-    if not text or not text.strip():
+    if not text:
+        return 0
+    text = text.strip()
+    if not text:
         return 0
 
     # Method 1: Perl with acronym and number support (most accurate - 78%)
     if method == "perl":
-        count = _count_syllables_perl_word_by_word(text)
+        count = _perl_text_cache.get(text)
+        if count is None:
+            count = _count_syllables_perl_word_by_word(text)
+            if count > 0:
+                if len(_perl_text_cache) >= _PERL_TEXT_CACHE_MAX:
+                    _perl_text_cache.clear()
+                _perl_text_cache[text] = count
         if count > 0:
             return count
         # Fall back to Python if Perl fails
         logger.info("Perl failed, falling back to Python method")
 
     # Method 2: Python (fallback or explicit choice)
-    # Clean and normalize text - but preserve original case for CamelCase detection
-    text = text.strip()
+    return _count_syllables_python(text)
+
+
+@lru_cache(maxsize=50000)
+def _count_syllables_python(text: str) -> int:
+    """Count syllables in already-stripped, non-empty text with Python (cached).
+
+    Args:
+        text: Stripped text to count syllables in
+
+    Returns:
+        Total syllable count
+    """
+    # Preserve original case for CamelCase detection
 
     # Remove punctuation but keep spaces, hyphens, and apostrophes
-    cleaned = re.sub(r"[^\w\s\-']", '', text)
+    cleaned = _strip_punctuation(text)
 
     # Split into words (split on spaces and hyphens)
-    words = re.split(r'[\s\-]+', cleaned)
+    words = cleaned.replace('-', ' ').split()
 
     if not words:
         return 0
 
+    acronyms = _load_acronym_cache()
     total = 0
 
     for word in words:
-        if not word:
-            continue
+        word_lower = word.lower()
 
         # Priority 1: Check if it's a known acronym
-        acronym_count = _check_acronym(word)
+        acronym_count = acronyms.get(word_lower, 0)
         if acronym_count > 0:
             total += acronym_count
             logger.debug(f"Word: '{word}' -> acronym={acronym_count}")
             continue
 
+        # Unknown short all-caps words with no vowels ("KVM", "HTTP") are
+        # spelled out letter by letter; the libraries can't read them
+        if word.isupper() and 1 < len(word) <= 5 and not _VOWEL_GROUP_RE.search(word_lower):
+            total += len(word)
+            logger.debug(f"Word: '{word}' -> spelled={len(word)}")
+            continue
+
         # Priority 2: Try to split CamelCase
         parts = _split_camelcase(word)
 
-        # Process each part (will be single word if no CamelCase)
+        # Not CamelCase: the acronym check above already covered this word
+        if len(parts) == 1:
+            total += _word_syllables(word_lower)
+            continue
+
+        # Process each CamelCase part
         for part in parts:
             part_lower = part.lower()
 
             # Check if part is an acronym (e.g., "B" in "EvilB")
-            acronym_count = _check_acronym(part_lower)
+            acronym_count = acronyms.get(part_lower, 0)
             if acronym_count > 0:
                 total += acronym_count
                 logger.debug(f"Part: '{part}' -> acronym={acronym_count}")
                 continue
 
-            # Use Python syllables library (UPDATED: syllables first, pyphen fallback)
-            syllables_count = _count_syllables_library(part_lower)
-            pyphen_count = _count_syllables_pyphen(part_lower)
+            total += _word_syllables(part_lower)
 
-            # Prefer syllables library (more accurate), fallback to pyphen
-            if syllables_count > 0:
-                word_count = syllables_count
-            elif pyphen_count > 0:
-                word_count = pyphen_count
-            else:
-                # Neither library could count, use heuristic
-                word_count = _count_syllables_heuristic(part_lower)
+    return total
 
-            total += word_count
 
-            logger.debug(f"Part: '{part}' -> syllables={syllables_count}, "
-                        f"pyphen={pyphen_count}, chosen={word_count}")
+@lru_cache(maxsize=16384)
+def _word_syllables(word: str) -> int:
+    """Count syllables in a single lowercase word with the Python libraries.
 
-    return total
+    Cached because chat vocabulary repeats heavily between lines.
+
+    Args:
+        word: Single lowercase word
+
+    Returns:
+        Syllable count
+    """
+    # Trust the CMU dictionary when it knows the word, else pyphen when it
+    # finds a hyphenation point. Words neither can split (unknown words
+    # pyphen sees as one piece, e.g. "idea") go to the syllables library,
+    # then the heuristic. Most words cost a single inline dict lookup.
+    word_count = (
+        _load_cmu().get(word, 0)
+        or _count_syllables_pyphen(word)
+        or _count_syllables_library(word)
+        or _count_syllables_heuristic(word)
+    )
+
+    logger.debug(f"Word: '{word}' -> chosen={word_count}")
+
+    return word_count
+
+
+def count_syllables_bulk(texts: List[str], method: str = "perl") -> List[int]:
+    """Count syllables for many texts at once.
+
+    With the "perl" method, every distinct word not already cached is
+    counted in a single Perl subprocess up front, instead of forking once
+    per word. Acronym, number and Python-fallback handling is the same as
+    count_syllables().
+
+    Args:
+        texts: Texts to count syllables in
+        method: Counting method - "perl" (default) or "python"
+
+    Returns:
+        Total syllable count per text, in order
+    """
+    if method != "perl":
+        return [count_syllables(text, method=method) for text in texts]
+
+    # Collect the words that would otherwise each need a Perl call
+    acronyms = _load_acronym_cache()
+    pending = set()
+    for text in texts:
+        for word in _perl_words(text or '', acronyms):
+            if word not in _perl_word_cache:
+                pending.add(word)
+
+    # Small batches (e.g. validating one haiku) go through the running
+    # coprocess; large ones get a one-shot Perl run that streams safely
+    pending_words = list(pending)
+    if len(pending_words) <= _PERL_COPROCESS_BATCH_MAX:
+        batch_counts = _count_syllables_perl_many(pending_words)
+    else:
+        batch_counts = _count_syllables_perl_batch(pending_words)
+    perl_counts = {
+        word: count for word, count in zip(pending_words, batch_counts) if count > 0
+    }
+    logger.debug(f"Perl batch counted {len(perl_counts)}/{len(pending_words)} words")
+
+    results = []
+    for text in texts:
+        if not text or not text.strip():
+            results.append(0)
+            continue
+        count = _count_syllables_perl_word_by_word(text, perl_counts)
+        if count <= 0:
+            logger.info("Perl failed, falling back to Python method")
+            count = count_syllables(text, method="python")
+        results.append(count)
+
+    return results
 
 
 def _count_syllables_pyphen(word: str) -> int:
     """Count syllables using pyphen hyphenation.
     
+    A word with no hyphenation points can't be told apart from one the
+    patterns don't cover, so it is reported as unknown rather than as a
+    single syllable.
+    
     Args:
         word: Single word
         
     Returns:
         Syllable count (0 if unable to determine)
     """
+    if not word:
+        return 0
+
     try:
-        hyphenated = _hyphenator.inserted(word)
-        if hyphenated:
-            # Count hyphens + 1 = syllable count
-            return hyphenated.count('-') + 1
+        # Hyphenation points + 1 = syllable count
+        positions = _hyphenator.positions(word)
+        if positions:
+            return len(positions) + 1
     except Exception as e:
         logger.debug(f"pyphen failed for '{word}': {e}")
     
@@ -326,26 +697,36 @@ def _count_syllables_library(word: str) -> int:
     return 0
 
 
-def _count_syllables_cmu(word: str) -> int:
-    """Count syllables using CMU Pronouncing Dictionary.
+def _load_cmu() -> dict:
+    """Build the CMU word -> syllable count table on first use.
 
-    Args:
-        word: Single word
+    Walks the CMU Pronouncing Dictionary once, counting stress-marked
+    vowels in each word's first pronunciation, so later lookups are a
+    single dict access.
 
     Returns:
-        Syllable count (0 if unable to determine)
+        Dictionary mapping lowercase word to syllable count
     """
-    try:
-        # Get phonetic representations for the word
-        phones = pronouncing.phones_for_word(word.lower())
-        if phones:
-            # Use the first pronunciation
-            # CMU dict counts syllables by stress markers on vowels
-            return pronouncing.syllable_count(phones[0])
-    except Exception as e:
-        logger.debug(f"CMU dict failed for '{word}': {e}")
+    global _cmu_syllables
 
-    return 0
+    if _cmu_syllables is not None:
+        return _cmu_syllables
+
+    with _cmu_lock:
+        if _cmu_syllables is None:
+            table = {}
+            try:
+                pronouncing.init_cmu()
+                for word, phones in pronouncing.pronunciations:
+                    # First pronunciation wins, as with phones_for_word()[0]
+                    if word not in table:
+                        table[word] = sum(1 for ph in phones.split() if ph[-1].isdigit())
+                logger.info(f"Loaded {len(table)} CMU dictionary words")
+            except Exception as e:
+                logger.warning(f"Failed to load CMU dictionary: {e}")
+            _cmu_syllables = table
+
+    return _cmu_syllables
 
 
 def _count_syllables_heuristic(word: str) -> int:
@@ -368,31 +749,27 @@ def _count_syllables_heuristic(word: str) -> int:
     word = word.lower()
     
     # Count vowel groups
-    vowels = "aeiouy"
-    syllable_count = 0
-    previous_was_vowel = False
-    
-    for char in word:
-        is_vowel = char in vowels
-        if is_vowel and not previous_was_vowel:
-            syllable_count += 1
-        previous_was_vowel = is_vowel
+    syllable_count = len(_VOWEL_GROUP_RE.findall(word))
     
     # Adjust for silent 'e'
     if word.endswith('e') and syllable_count > 1:
         syllable_count -= 1
     
     # Adjust for 'le' ending
-    if word.endswith('le') and len(word) > 2 and word[-3] not in vowels:
+    if word.endswith('le') and len(word) > 2 and word[-3] not in _VOWELS:
         syllable_count += 1
     
     # Every word has at least one syllable
     return max(1, syllable_count)
 
 
+@lru_cache(maxsize=100000)
 def is_valid_english_word(word: str) -> bool:
     """Check if a word is valid English or an approved acronym.
 
+    Cached per word. The acronym table is read once per process, so
+    acronyms added later are picked up on restart.
+
     Valid words are:
     - In the CMU Pronouncing Dictionary
     - In the approved acronyms database
@@ -414,19 +791,14 @@ def is_valid_english_word(word: str) -> bool:
         return True
 
     # Check if it's an approved acronym
-    acronym_count = _check_acronym(word_lower)
-    if acronym_count > 0:
+    if word_lower in _load_acronym_cache():
         logger.debug(f"Word '{word}' validated as acronym")
         return True
 
     # Check CMU Pronouncing Dictionary
-    try:
-        phones = pronouncing.phones_for_word(word_lower)
-        if phones:
-            logger.debug(f"Word '{word}' found in CMU dictionary")
-            return True
-    except Exception as e:
-        logger.debug(f"CMU lookup failed for '{word}': {e}")
+    if word_lower in _load_cmu():
+        logger.debug(f"Word '{word}' found in CMU dictionary")
+        return True
 
     # Word not found in any dictionary
     logger.debug(f"Word '{word}' not found in dictionaries")
@@ -452,17 +824,14 @@ def validate_line_for_auto_collection(text: str) -> tuple[bool, Optional[str]]:
         return False, "Empty text"
 
     # Clean text - remove punctuation but keep letters, numbers, spaces, hyphens, apostrophes
-    cleaned = re.sub(r"[^\w\s\-']", '', text)
+    cleaned = _strip_punctuation(text)
 
     # Split into words
-    words = re.split(r'[\s\-]+', cleaned)
+    words = cleaned.replace('-', ' ').split()
 
     # Check each word
     invalid_words = []
     for word in words:
-        if not word:
-            continue
-
         if not is_valid_english_word(word):
             invalid_words.append(word)
 
@@ -475,6 +844,27 @@ def validate_line_for_auto_collection(text: str) -> tuple[bool, Optional[str]]:
     return True, None
 
 
+def exceeds_syllables(text: str, limit: int) -> bool:
+    """Cheaply tell whether text certainly has more than limit syllables.
+
+    Every word containing a letter or digit counts as at least one
+    syllable with every method (Perl, acronyms, and the Python fallbacks),
+    so more than limit such words means more than limit syllables. Tokens
+    left with only apostrophes or underscores can count as zero and are
+    ignored. Used to discard long chat lines before running the real
+    counter.
+
+    Args:
+        text: Text to check
+        limit: Syllable limit
+
+    Returns:
+        True if text has more than limit words with a letter or digit
+    """
+    words = _strip_punctuation(text).replace('-', ' ').split()
+    return sum(1 for word in words if _ALNUM_RE.search(word)) > limit
+
+
 def is_haiku_line(text: str, target_syllables: int) -> bool:
     """Check if text matches target syllable count.
 
@@ -485,7 +875,33 @@ def is_haiku_line(text: str, target_syllables: int) -> bool:
     Returns:
         True if text has exactly target_syllables syllables
     """
-    return count_syllables(text) == target_syllables
+    return _count_syllables_bounded(text, target_syllables) == target_syllables
+
+
+def _count_syllables_bounded(text: str, limit: int) -> int:
+    """Count syllables like count_syllables(), but stop once past limit.
+
+    Lines that are obviously too long stop being counted (and don't send
+    their remaining words to Perl) as soon as the running total exceeds
+    limit.
+
+    Args:
+        text: Text to count syllables in
+        limit: Largest count of interest
+
+    Returns:
+        Exact syllable count if it is at most limit, otherwise some value
+        greater than limit
+    """
+    if not text or not text.strip():
+        return 0
+
+    count = _count_syllables_perl_word_by_word(text, limit=limit)
+    if count > 0:
+        return count
+
+    logger.info("Perl failed, falling back to Python method")
+    return count_syllables(text, method="python")
 
 
 def validate_haiku(line1: str, line2: str, line3: str) -> tuple[bool, Optional[str]]:
@@ -499,12 +915,41 @@ def validate_haiku(line1: str, line2: str, line3: str) -> tuple[bool, Optional[s
     Returns:
         Tuple of (is_valid, error_message)
     """
-    counts = [
-        count_syllables(line1),
-        count_syllables(line2),
-        count_syllables(line3)
-    ]
-    
+    return validate_haikus_batch([(line1, line2, line3)])[0]
+
+
+def validate_haikus_batch(
+    triples: List[Tuple[str, str, str]]
+) -> List[Tuple[bool, Optional[str]]]:
+    """Validate many candidate haikus at once.
+
+    Every line of every candidate is counted in a single
+    count_syllables_bulk() call, so uncached words across all candidates
+    share one Perl subprocess.
+
+    Args:
+        triples: Candidate (line1, line2, line3) tuples
+
+    Returns:
+        (is_valid, error_message) per candidate, in order
+    """
+    counts = count_syllables_bulk([line for triple in triples for line in triple])
+
+    results = []
+    for i in range(0, len(counts), 3):
+        results.append(_check_haiku_counts(counts[i:i + 3]))
+    return results
+
+
+def _check_haiku_counts(counts: List[int]) -> Tuple[bool, Optional[str]]:
+    """Check per-line syllable counts against the 5-7-5 pattern.
+
+    Args:
+        counts: Syllable counts of the three lines
+
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
     if counts[0] != 5:
         return False, f"Line 1 has {counts[0]} syllables (expected 5)"
     
@@ -515,4 +960,3 @@ def validate_haiku(line1: str, line2: str, line3: str) -> tuple[bool, Optional[s
         return False, f"Line 3 has {counts[2]} syllables (expected 5)"
     
     return True, None
-
@@ -1,19 +1,29 @@
 """IRC bot implementation using irc library."""
 
+import asyncio
+import concurrent.futures
 import logging
+import re
 import ssl
+import threading
 import irc.bot
+import irc.client
 import irc.connection
 import irc.strings
 from datetime import datetime
 
+from ..api.websocket import broadcast_new_line, get_connection_manager
 from ..config import get_config
-from ..database import get_session, Line, User
-from ..haiku import count_syllables, validate_line_for_auto_collection
-from .commands import CommandHandler, Response
+from ..database import get_session, Line
+from ..haiku import count_syllables, exceeds_syllables, validate_line_for_auto_collection
+from ..utils.auth import is_opted_out
+from .commands import CommandHandler, Response, DUPLICATE_LINE_STMT
 
 logger = logging.getLogger(__name__)
 
+# Links never survive word validation, so skip them before counting
+_HAS_URL = re.compile(r'https?://|www\.', re.IGNORECASE)
+
 
 class HaikuBot(irc.bot.SingleServerIRCBot):
     """HaikuBot IRC client.
@@ -59,9 +69,48 @@ class HaikuBot(irc.bot.SingleServerIRCBot):
         
         self.command_handler = CommandHandler(self)
         self.channels_to_join = server_config.channels
+
+        # One long-lived event loop per bot for async command handling and
+        # WebSocket broadcasts, instead of a fresh loop per message
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever,
+            name=f"IRC-{server_name}-loop",
+            daemon=True
+        )
+        self._loop_thread.start()
         
         logger.info(f"HaikuBot initialized for server: {server_name}")
     
+    def _run_async(self, coro, description: str, timeout: float = 30.0):
+        """Run a coroutine on the bot's event loop and wait for the result.
+        
+        On timeout the coroutine is cancelled, so it can't finish its work
+        after the caller has already reported failure.
+        
+        Args:
+            coro: Coroutine to run
+            description: What the coroutine is doing, for the timeout log
+            timeout: Seconds to wait before giving up
+            
+        Returns:
+            The coroutine's return value
+            
+        Raises:
+            concurrent.futures.TimeoutError: If it didn't finish in time
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.error(f"[{self.server_name}] Timed out after {timeout}s: {description}")
+            raise
+    
+    def stop_loop(self):
+        """Stop the bot's event loop thread."""
+        self._loop.call_soon_threadsafe(self._loop.stop)
+    
     def on_nicknameinuse(self, connection, event):
         """Called when nickname is already in use."""
         connection.nick(connection.get_nickname() + "_")
@@ -154,14 +203,11 @@ class HaikuBot(irc.bot.SingleServerIRCBot):
             message: Full message text
         """
         try:
-            # Use synchronous wrapper since irc.bot is not async
-            import asyncio
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            response = loop.run_until_complete(
-                self.command_handler.handle(source, channel, message)
+            # irc.bot is not async; run the handler on the bot's loop and wait
+            response = self._run_async(
+                self.command_handler.handle(source, channel, message),
+                f"command {message!r} from {source} in {channel}"
             )
-            loop.close()
             
             if response:
                 # Handle Response object
@@ -205,12 +251,18 @@ class HaikuBot(irc.bot.SingleServerIRCBot):
             channel: Channel where message was sent
             message: Message text
         """
-        # Check if user has opted out
-        with get_session() as session:
-            user = session.query(User).filter(User.username == username).first()
-            if user and user.opted_out:
-                logger.debug(f"User {username} has opted out, skipping auto-collect")
-                return
+        # Check if user has opted out (answered from memory)
+        if is_opted_out(username):
+            logger.debug(f"User {username} has opted out, skipping auto-collect")
+            return
+
+        # Most chat lines have more than 7 words and can be dropped without
+        # counting (every word is at least one syllable)
+        if exceeds_syllables(message, 7):
+            return
+
+        if _HAS_URL.search(message):
+            return
 
         # Count syllables
         syllable_count = count_syllables(message)
@@ -229,9 +281,7 @@ class HaikuBot(irc.bot.SingleServerIRCBot):
         try:
             with get_session() as session:
                 # Check for duplicate (case-insensitive)
-                existing = session.query(Line).filter(
-                    Line.text.ilike(message)
-                ).first()
+                existing = session.execute(DUPLICATE_LINE_STMT, {'text': message}).first()
                 
                 if existing:
                     logger.debug(f"Line already exists: {message}")
@@ -254,28 +304,24 @@ class HaikuBot(irc.bot.SingleServerIRCBot):
 
                 logger.info(f"[{self.server_name}][{channel}] Auto-collected {syllable_count}-syllable line from {username}: {message}")
 
-                # Broadcast to WebSocket clients
-                line_data = {
-                    'id': line.id,
-                    'text': line.text,
-                    'syllable_count': line.syllable_count,
-                    'username': line.username,
-                    'channel': line.channel,
-                    'server': line.server,
-                    'source': line.source,
-                    'timestamp': line.timestamp.isoformat()
-                }
+                # Broadcast to WebSocket clients (skipped when nobody is listening,
+                # which also avoids reloading the committed line)
+                if get_connection_manager().has_listeners():
+                    line_data = {
+                        'id': line.id,
+                        'text': line.text,
+                        'syllable_count': line.syllable_count,
+                        'username': line.username,
+                        'channel': line.channel,
+                        'server': line.server,
+                        'source': line.source,
+                        'timestamp': line.timestamp.isoformat()
+                    }
 
-                # Import and call broadcast function
-                import asyncio
-                from ..api.websocket import broadcast_new_line
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(broadcast_new_line(line_data))
-                    loop.close()
-                except Exception as ws_error:
-                    logger.error(f"Error broadcasting line to WebSocket: {ws_error}")
+                    try:
+                        self._run_async(broadcast_new_line(line_data), f"broadcast of line #{line.id}")
+                    except Exception as ws_error:
+                        logger.error(f"Error broadcasting line to WebSocket: {ws_error}")
 
         except Exception as e:
             logger.error(f"Error auto-collecting line: {e}", exc_info=True)
@@ -297,3 +343,44 @@ class HaikuBot(irc.bot.SingleServerIRCBot):
             text: Notice text
         """
         self.connection.notice(target, text)
+    
+    def send_notice_many(self, target: str, lines: list):
+        """Send several notices to a user in a single socket write.
+        
+        Every line is framed and checked the way connection.notice() does
+        it (no newlines, 512 bytes per message) before anything is sent,
+        then all frames go out together. Like send_raw(), this raises
+        ServerNotConnectedError when disconnected and drops the connection
+        on a socket error so the bot reconnects. Empty lines are skipped.
+        
+        Args:
+            target: Nickname to send notices to
+            lines: Notice texts, one NOTICE per entry
+            
+        Raises:
+            irc.client.ServerNotConnectedError: If not connected
+            irc.client.InvalidCharacters: If a line contains a newline
+            irc.client.MessageTooLong: If a framed line exceeds 512 bytes
+        """
+        connection = self.connection
+        if connection.socket is None:
+            raise irc.client.ServerNotConnectedError("Not connected.")
+        
+        frames = []
+        for text in lines:
+            if not text:
+                continue
+            message = f"NOTICE {target} :{text}"
+            if '\n' in message:
+                raise irc.client.InvalidCharacters("Carriage returns not allowed in notice text")
+            frame = connection.encode(message) + b'\r\n'
+            if len(frame) > 512:
+                raise irc.client.MessageTooLong("Messages limited to 512 bytes including CR/LF")
+            frames.append(frame)
+        
+        if not frames:
+            return
+        try:
+            connection.socket.sendall(b''.join(frames))
+        except OSError:
+            connection.disconnect("Connection reset by peer.")
@@ -1,21 +1,46 @@
 """IRC command handlers."""
 
+import asyncio
 import logging
 import re
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 from dataclasses import dataclass
+from sqlalchemy import bindparam, desc, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from ..api.websocket import broadcast_new_line, get_connection_manager
 from ..config import get_config
 from ..database import get_session, Line, User, Vote, GeneratedHaiku
 from ..haiku import count_syllables, generate_haiku, generate_haiku_for_user, generate_haiku_for_channel, get_haiku_stats
-from ..utils.auth import get_or_create_user, can_user_submit, is_user_admin
+from ..utils.auth import get_or_create_user, can_user_submit, is_user_admin, set_opt_out
 
 if TYPE_CHECKING:
     from .bot import HaikuBot
 
 logger = logging.getLogger(__name__)
 
+# Duplicate-line lookup built once; the text is bound per call so the
+# statement is compiled once and then served from SQLAlchemy's cache
+DUPLICATE_LINE_STMT = select(Line.id).where(
+    func.lower(Line.text) == func.lower(bindparam('text'))
+).limit(1)
+
+# Fire-and-forget broadcast tasks still in flight
+_background_tasks = set()
+
+
+async def _safe_broadcast_line(line_data: dict):
+    """Broadcast a new line to WebSocket clients, logging any failure.
+
+    Args:
+        line_data: Dictionary with line information
+    """
+    try:
+        await broadcast_new_line(line_data)
+    except Exception as ws_error:
+        logger.error(f"Error broadcasting line to WebSocket: {ws_error}")
+
 
 @dataclass
 class Response:
@@ -56,6 +81,38 @@ class CommandHandler:
         self.bot = bot
         self.config = get_config()
         self.prefix = self.config.bot.trigger_prefix
+        self._prefix_len = len(self.prefix)
+        web_url = getattr(self.config.bot, 'web_url', "")
+        self._url_suffix = f" -- {web_url}" if web_url else ""
+        self._help_lines = self._build_help_lines()
+        self._help_text = '\n'.join(self._help_lines)
+        
+        # Command routing tables, built once per handler
+        self._handlers = {
+            'haiku': self._cmd_haiku,
+            'haiku5': self._cmd_haiku5,
+            'haiku7': self._cmd_haiku7,
+            'haikumanual': self._cmd_haiku_manual,
+            'haikuauto': self._cmd_haiku_auto,
+            'haikustats': self._cmd_stats,
+            'haikuvote': self._cmd_vote,
+            'haikutop': self._cmd_top,
+            'myhaiku': self._cmd_my_haiku,
+            'mystats': self._cmd_my_stats,
+            'haikuhelp': self._cmd_help,
+            'haikulist': self._cmd_list,
+            'haikusyl': self._cmd_syllable_check,
+            'haikuflag': self._cmd_flag,
+        }
+        # Subcommands of !haiku (e.g., "haiku promote")
+        self._sub_handlers = {
+            'promote': self._cmd_promote,
+            'demote': self._cmd_demote,
+            'editors': self._cmd_editors,
+            'optout': self._cmd_optout,
+            'optin': self._cmd_optin,
+            'delete': self._cmd_delete,
+        }
     
     async def handle(self, username: str, channel: str, message: str) -> Optional[Response]:
         """Handle a command message.
@@ -72,7 +129,7 @@ class CommandHandler:
         if not message.startswith(self.prefix):
             return None
         
-        command_text = message[len(self.prefix):].strip()
+        command_text = message[self._prefix_len:].strip()
         
         # Parse command and arguments
         parts = command_text.split(maxsplit=1)
@@ -82,40 +139,18 @@ class CommandHandler:
         logger.info(f"Command: {command}, Args: {args}, User: {username}, Channel: {channel}")
         
         # Route to appropriate handler
-        handler_map = {
-            'haiku': self._cmd_haiku,
-            'haiku5': self._cmd_haiku5,
-            'haiku7': self._cmd_haiku7,
-            'haikumanual': self._cmd_haiku_manual,
-            'haikuauto': self._cmd_haiku_auto,
-            'haikustats': self._cmd_stats,
-            'haikuvote': self._cmd_vote,
-            'haikutop': self._cmd_top,
-            'myhaiku': self._cmd_my_haiku,
-            'mystats': self._cmd_my_stats,
-            'haikuhelp': self._cmd_help,
-            'haikulist': self._cmd_list,
-            'haikusyl': self._cmd_syllable_check,
-            'haikuflag': self._cmd_flag,
-        }
+        handler = self._handlers.get(command)
         
         # Check for subcommands (e.g., "haiku promote")
         if command == 'haiku' and args:
-            subcommand = args.split()[0].lower()
-            if subcommand in ['promote', 'demote', 'editors', 'optout', 'optin', 'delete']:
+            sub_parts = args.split(maxsplit=1)
+            subcommand = sub_parts[0].lower()
+            sub_handler = self._sub_handlers.get(subcommand)
+            if sub_handler:
+                handler = sub_handler
                 command = f'haiku_{subcommand}'
-                args = args.split(maxsplit=1)[1] if len(args.split()) > 1 else ""
-
-                handler_map.update({
-                    'haiku_promote': self._cmd_promote,
-                    'haiku_demote': self._cmd_demote,
-                    'haiku_editors': self._cmd_editors,
-                    'haiku_optout': self._cmd_optout,
-                    'haiku_optin': self._cmd_optin,
-                    'haiku_delete': self._cmd_delete,
-                })
+                args = sub_parts[1] if len(sub_parts) > 1 else ""
         
-        handler = handler_map.get(command)
         if handler:
             try:
                 return await handler(username, channel, args)
@@ -125,6 +160,81 @@ class CommandHandler:
 
         return None
     
+    def _format_haiku(self, haiku: GeneratedHaiku, tag: Optional[str] = None) -> Response:
+        """Format a generated haiku with its vote hint, sources and web URL.
+
+        Args:
+            haiku: Haiku to announce
+            tag: Optional label shown in brackets before the haiku
+
+        Returns:
+            Success response
+        """
+        # Get sources (usernames of each line contributor)
+        sources = f"({haiku.line1.username}, {haiku.line2.username}, {haiku.line3.username})"
+        tag_part = f"[{tag}] " if tag else ""
+
+        return Response.success(f"{tag_part}{haiku.full_text} -- `{self.prefix}haikuvote {haiku.id}` -- Sources: {sources}{self._url_suffix}")
+
+    def _schedule_line_broadcast(self, line: Line):
+        """Broadcast a newly stored line to WebSocket clients in the background.
+
+        Skipped when nobody is listening. The command replies without
+        waiting for the broadcast to finish.
+
+        Args:
+            line: Committed line to announce
+        """
+        if not get_connection_manager().has_listeners():
+            return
+
+        line_data = {
+            'id': line.id,
+            'text': line.text,
+            'syllable_count': line.syllable_count,
+            'username': line.username,
+            'channel': line.channel,
+            'server': line.server,
+            'source': line.source,
+            'timestamp': line.timestamp.isoformat()
+        }
+        task = asyncio.create_task(_safe_broadcast_line(line_data))
+        # Keep a reference so the task isn't garbage collected mid-flight
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    def _build_help_lines(self) -> list:
+        """Build the help text lines; they only depend on config.
+
+        Returns:
+            List of help lines
+        """
+        return [
+            "=== HaikuBot Commands ===",
+            f"{self.prefix}haiku - Generate random haiku",
+            f"{self.prefix}haiku @user - Generate from user's lines",
+            f"{self.prefix}haiku #channel - Generate from channel's lines",
+            f"{self.prefix}haikumanual - Generate from manual lines only",
+            f"{self.prefix}haikuauto - Generate from auto-collected lines only",
+            f"{self.prefix}haikustats - Statistics | {self.prefix}haikuvote <id> - Vote",
+            f"{self.prefix}haikutop - Top haikus | {self.prefix}myhaiku - Your lines",
+            f"{self.prefix}mystats - Your stats | {self.prefix}haikusyl <text> - Check syllables",
+            "",
+            "=== Editor Commands ===",
+            f"{self.prefix}haiku5 <text> - Submit 5-syllable line",
+            f"{self.prefix}haiku5 --first <text> - First position only",
+            f"{self.prefix}haiku5 --last <text> - Last position only",
+            f"{self.prefix}haiku7 <text> - Submit 7-syllable line",
+            f"{self.prefix}haikuflag <line_id> - Flag line for review",
+            "",
+            "=== Admin Commands ===",
+            f"{self.prefix}haiku promote/demote @user - Manage editors",
+            f"{self.prefix}haiku delete line/haiku <id> - Delete content",
+            f"{self.prefix}haiku editors - List all editors",
+            "",
+            f"Web: {self.config.bot.web_url}"
+        ]
+
     async def _cmd_haiku(self, username: str, channel: str, args: str) -> Response:
         """Generate a random haiku or retrieve specific haiku by ID.
 
@@ -171,14 +281,7 @@ class CommandHandler:
             if not haiku:
                 return Response.error("Not enough lines to generate a haiku. Contribute with !haiku5 or !haiku7!")
 
-            # Get sources (usernames of each line contributor)
-            sources = f"({haiku.line1.username}, {haiku.line2.username}, {haiku.line3.username})"
-
-            # Format response with sources and URL
-            web_url = self.config.bot.web_url if hasattr(self.config.bot, 'web_url') else ""
-            url_part = f" -- {web_url}" if web_url else ""
-
-            return Response.success(f"{haiku.full_text} -- `{self.prefix}haikuvote {haiku.id}` -- Sources: {sources}{url_part}")
+            return self._format_haiku(haiku)
 
     async def _cmd_haiku_manual(self, username: str, channel: str, args: str) -> Response:
         """Generate a haiku using only manually submitted lines."""
@@ -191,14 +294,7 @@ class CommandHandler:
             if not haiku:
                 return Response.error("Not enough manual lines to generate a haiku. Editors can submit with !haiku5 or !haiku7!")
 
-            # Get sources (usernames of each line contributor)
-            sources = f"({haiku.line1.username}, {haiku.line2.username}, {haiku.line3.username})"
-
-            # Format response with sources and URL
-            web_url = self.config.bot.web_url if hasattr(self.config.bot, 'web_url') else ""
-            url_part = f" -- {web_url}" if web_url else ""
-
-            return Response.success(f"[Manual] {haiku.full_text} -- `{self.prefix}haikuvote {haiku.id}` -- Sources: {sources}{url_part}")
+            return self._format_haiku(haiku, 'Manual')
 
     async def _cmd_haiku_auto(self, username: str, channel: str, args: str) -> Response:
         """Generate a haiku using only auto-collected lines."""
@@ -211,14 +307,7 @@ class CommandHandler:
             if not haiku:
                 return Response.error("Not enough auto-collected lines to generate a haiku. Lines are automatically collected from IRC.")
 
-            # Get sources (usernames of each line contributor)
-            sources = f"({haiku.line1.username}, {haiku.line2.username}, {haiku.line3.username})"
-
-            # Format response with sources and URL
-            web_url = self.config.bot.web_url if hasattr(self.config.bot, 'web_url') else ""
-            url_part = f" -- {web_url}" if web_url else ""
-
-            return Response.success(f"[Auto] {haiku.full_text} -- `{self.prefix}haikuvote {haiku.id}` -- Sources: {sources}{url_part}")
+            return self._format_haiku(haiku, 'Auto')
 
     async def _cmd_haiku5(self, username: str, channel: str, args: str) -> Response:
         """Submit a 5-syllable line.
@@ -251,7 +340,7 @@ class CommandHandler:
         # Store line
         with get_session() as session:
             # Check for duplicate
-            existing = session.query(Line).filter(Line.text.ilike(text)).first()
+            existing = session.execute(DUPLICATE_LINE_STMT, {'text': text}).first()
             if existing:
                 return Response.error("That line already exists in the database.")
             
@@ -270,23 +359,8 @@ class CommandHandler:
             session.add(line)
             session.commit()
 
-            # Broadcast to WebSocket clients
-            import asyncio
-            from ..api.websocket import broadcast_new_line
-            line_data = {
-                'id': line.id,
-                'text': line.text,
-                'syllable_count': line.syllable_count,
-                'username': line.username,
-                'channel': line.channel,
-                'server': line.server,
-                'source': line.source,
-                'timestamp': line.timestamp.isoformat()
-            }
-            try:
-                await broadcast_new_line(line_data)
-            except Exception as ws_error:
-                logger.error(f"Error broadcasting line to WebSocket: {ws_error}")
+            # Broadcast to WebSocket clients without waiting on them
+            self._schedule_line_broadcast(line)
 
             placement_str = f" ({placement} position)" if placement != 'any' else ""
             return Response.notice(f"Added 5-syllable line{placement_str}: {text}")
@@ -310,7 +384,7 @@ class CommandHandler:
         # Store line
         with get_session() as session:
             # Check for duplicate
-            existing = session.query(Line).filter(Line.text.ilike(text)).first()
+            existing = session.execute(DUPLICATE_LINE_STMT, {'text': text}).first()
             if existing:
                 return Response.error("That line already exists in the database.")
             
@@ -329,22 +403,8 @@ class CommandHandler:
             session.add(line)
             session.commit()
 
-            # Broadcast to WebSocket clients
-            from ..api.websocket import broadcast_new_line
-            line_data = {
-                'id': line.id,
-                'text': line.text,
-                'syllable_count': line.syllable_count,
-                'username': line.username,
-                'channel': line.channel,
-                'server': line.server,
-                'source': line.source,
-                'timestamp': line.timestamp.isoformat()
-            }
-            try:
-                await broadcast_new_line(line_data)
-            except Exception as ws_error:
-                logger.error(f"Error broadcasting line to WebSocket: {ws_error}")
+            # Broadcast to WebSocket clients without waiting on them
+            self._schedule_line_broadcast(line)
 
             return Response.notice(f"Added 7-syllable line: {text}")
 
@@ -395,33 +455,29 @@ class CommandHandler:
         haiku_id = int(args.strip())
 
         with get_session() as session:
-            # Check if haiku exists
-            haiku = session.query(GeneratedHaiku).filter(GeneratedHaiku.id == haiku_id).first()
-            if not haiku:
+            # Bump the count first; no row back means the haiku doesn't exist
+            vote_count = session.execute(
+                update(GeneratedHaiku)
+                .where(GeneratedHaiku.id == haiku_id)
+                .values(vote_count=GeneratedHaiku.vote_count + 1)
+                .returning(GeneratedHaiku.vote_count)
+            ).scalar()
+            if vote_count is None:
                 return Response.error(f"Haiku #{haiku_id} not found.")
 
-            # Check if already voted
-            existing_vote = session.query(Vote).filter(
-                Vote.haiku_id == haiku_id,
-                Vote.username == username
+            # Add vote; uq_vote_haiku_user turns a second vote into a no-op
+            inserted = session.execute(
+                sqlite_insert(Vote)
+                .values(haiku_id=haiku_id, username=username)
+                .on_conflict_do_nothing(index_elements=['haiku_id', 'username'])
+                .returning(Vote.id)
             ).first()
-
-            if existing_vote:
+            if inserted is None:
+                session.rollback()
                 return Response.error(f"You've already voted for haiku #{haiku_id}!")
 
-            # Add vote
-            vote = Vote(
-                haiku_id=haiku_id,
-                username=username,
-                voted_at=datetime.utcnow()
-            )
-
-            session.add(vote)
             session.commit()
 
-            # Get current vote count after committing
-            vote_count = session.query(Vote).filter(Vote.haiku_id == haiku_id).count()
-
             return Response.notice(f"Thanks for voting! Haiku #{haiku_id} now has {vote_count} vote(s).")
     
     async def _cmd_top(self, username: str, channel: str, args: str) -> Response:
@@ -432,13 +488,8 @@ class CommandHandler:
 
         with get_session() as session:
             # Query top haikus by vote count
-            from sqlalchemy import func, desc
-
-            results = session.query(
-                GeneratedHaiku,
-                func.count(Vote.id).label('vote_count')
-            ).outerjoin(Vote).group_by(GeneratedHaiku.id).order_by(
-                desc('vote_count'),
+            results = session.query(GeneratedHaiku).order_by(
+                desc(GeneratedHaiku.vote_count),
                 desc(GeneratedHaiku.generated_at)
             ).limit(limit).all()
 
@@ -446,16 +497,15 @@ class CommandHandler:
                 return Response.error("No haikus have been generated yet!")
 
             lines = [f"Top {len(results)} Haiku(s):"]
-            for haiku, vote_count in results:
-                lines.append(f"[{vote_count} votes] #{haiku.id}: {haiku.full_text}")
+            for haiku in results:
+                lines.append(f"[{haiku.vote_count} votes] #{haiku.id}: {haiku.full_text}")
 
             lines.append(f"Vote with {self.prefix}haikuvote <id>")
 
             # Send as PM if in channel (return multiline for PM)
             if channel != "PM":
                 # For channel messages, send notice
-                for line in lines:
-                    self.bot.send_notice(username, line)
+                self.bot.send_notice_many(username, lines)
                 return Response.success(f"{username}: Sent top haikus via notice")
             else:
                 return Response.success("\n".join(lines))
@@ -474,8 +524,7 @@ class CommandHandler:
 
             # Send as PM if in channel
             if channel != "PM":
-                for line in result:
-                    self.bot.send_notice(username, line)
+                self.bot.send_notice_many(username, result)
                 return Response.success(f"{username}: Sent your haiku lines via notice")
             else:
                 return Response.success("\n".join(result))
@@ -490,40 +539,12 @@ class CommandHandler:
     
     async def _cmd_help(self, username: str, channel: str, args: str) -> Response:
         """Show help information."""
-        help_lines = [
-            "=== HaikuBot Commands ===",
-            f"{self.prefix}haiku - Generate random haiku",
-            f"{self.prefix}haiku @user - Generate from user's lines",
-            f"{self.prefix}haiku #channel - Generate from channel's lines",
-            f"{self.prefix}haikumanual - Generate from manual lines only",
-            f"{self.prefix}haikuauto - Generate from auto-collected lines only",
-            f"{self.prefix}haikustats - Statistics | {self.prefix}haikuvote <id> - Vote",
-            f"{self.prefix}haikutop - Top haikus | {self.prefix}myhaiku - Your lines",
-            f"{self.prefix}mystats - Your stats | {self.prefix}haikusyl <text> - Check syllables",
-            "",
-            "=== Editor Commands ===",
-            f"{self.prefix}haiku5 <text> - Submit 5-syllable line",
-            f"{self.prefix}haiku5 --first <text> - First position only",
-            f"{self.prefix}haiku5 --last <text> - Last position only",
-            f"{self.prefix}haiku7 <text> - Submit 7-syllable line",
-            f"{self.prefix}haikuflag <line_id> - Flag line for review",
-            "",
-            "=== Admin Commands ===",
-            f"{self.prefix}haiku promote/demote @user - Manage editors",
-            f"{self.prefix}haiku delete line/haiku <id> - Delete content",
-            f"{self.prefix}haiku editors - List all editors",
-            "",
-            f"Web: {self.config.bot.web_url}"
-        ]
-
         # Send as PM if in channel
         if channel != "PM":
-            for line in help_lines:
-                if line:  # Only send non-empty lines
-                    self.bot.send_notice(username, line)
+            self.bot.send_notice_many(username, self._help_lines)  # Skips empty lines
             return Response.success(f"{username}: Sent help via notice")
         else:
-            return Response.success('\n'.join(help_lines))
+            return Response.success(self._help_text)
     
     async def _cmd_list(self, username: str, channel: str, args: str) -> Response:
         """List generated haikus."""
@@ -592,18 +613,14 @@ class CommandHandler:
     async def _cmd_optout(self, username: str, channel: str, args: str) -> Response:
         """Opt out of auto-collection."""
         with get_session() as session:
-            user = get_or_create_user(session, username)
-            user.opted_out = True
-            session.commit()
+            set_opt_out(session, username, True)
 
             return Response.success("You've opted out of auto-collection. Your messages won't be collected automatically.")
     
     async def _cmd_optin(self, username: str, channel: str, args: str) -> Response:
         """Opt back into auto-collection."""
         with get_session() as session:
-            user = get_or_create_user(session, username)
-            user.opted_out = False
-            session.commit()
+            set_opt_out(session, username, False)
 
             return Response.success("You've opted back into auto-collection. Your messages may be collected automatically.")
 
@@ -635,22 +652,28 @@ class CommandHandler:
 
         with get_session() as session:
             if item_type == 'line':
-                # Delete a line
-                line = session.query(Line).filter(Line.id == item_id).first()
-
-                if not line:
+                # Fetch the line and the IDs of haikus using it in one query
+                row = session.execute(
+                    select(Line, func.group_concat(GeneratedHaiku.id))
+                    .outerjoin(GeneratedHaiku, or_(
+                        GeneratedHaiku.line1_id == Line.id,
+                        GeneratedHaiku.line2_id == Line.id,
+                        GeneratedHaiku.line3_id == Line.id,
+                    ))
+                    .where(Line.id == item_id)
+                    .group_by(Line.id)
+                ).first()
+
+                if not row:
                     return Response.error(f"Line #{item_id} not found.")
 
-                # Check if line is used in any haikus
-                haikus_using_line = session.query(GeneratedHaiku).filter(
-                    (GeneratedHaiku.line1_id == item_id) |
-                    (GeneratedHaiku.line2_id == item_id) |
-                    (GeneratedHaiku.line3_id == item_id)
-                ).all()
+                line, haiku_ids = row
 
-                if haikus_using_line:
-                    haiku_ids = ', '.join(str(h.id) for h in haikus_using_line)
-                    return Response.error(f"Cannot delete line #{item_id}: Used in {len(haikus_using_line)} haiku(s) (IDs: {haiku_ids}). Delete those haikus first.")
+                # Refuse if line is used in any haikus
+                if haiku_ids:
+                    haiku_count = len(haiku_ids.split(','))
+                    haiku_ids = haiku_ids.replace(',', ', ')
+                    return Response.error(f"Cannot delete line #{item_id}: Used in {haiku_count} haiku(s) (IDs: {haiku_ids}). Delete those haikus first.")
 
                 line_text = line.text
                 session.delete(line)
@@ -665,9 +688,8 @@ class CommandHandler:
                 if not haiku:
                     return Response.error(f"Haiku #{item_id} not found.")
 
-                # Also delete associated votes
-                vote_count = session.query(Vote).filter(Vote.haiku_id == item_id).count()
-                session.query(Vote).filter(Vote.haiku_id == item_id).delete()
+                # Also delete associated votes; delete() reports how many went
+                vote_count = session.query(Vote).filter(Vote.haiku_id == item_id).delete()
 
                 haiku_text = haiku.full_text
                 session.delete(haiku)
@@ -687,8 +709,6 @@ class CommandHandler:
         if not args or not args.strip():
             return Response.error("Usage: !haikusyl <text>")
 
-        from backend.haiku.syllable_counter import count_syllables
-
         text = args.strip()
         syllable_count = count_syllables(text)
 
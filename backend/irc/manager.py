@@ -70,6 +70,7 @@ class IRCManager:
         for name, bot in self.bots.items():
             try:
                 logger.info(f"Disconnecting bot: {name}")
+                bot.stop_loop()
                 bot.die("Bot shutting down")
             except Exception as e:
                 logger.error(f"Error disconnecting {name}: {e}")
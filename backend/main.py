@@ -12,6 +12,7 @@ import uvicorn
 
 from .config import load_config, set_config
 from .database import init_db
+from .haiku import warm_up
 from .irc import IRCManager
 from .api import create_app
 
@@ -76,6 +77,10 @@ class HaikuBotApplication:
         init_db(database_url)
         logger.info("Database initialized")
         
+        # Load syllable dictionaries now rather than on the first message
+        warm_up()
+        logger.info("Syllable dictionaries loaded")
+        
         # Create IRC manager
         self.irc_manager = IRCManager(self.config.servers)
         logger.info("IRC manager created")
@@ -113,7 +118,10 @@ class HaikuBotApplication:
             host=self.config.web.host,
             port=self.config.web.port,
             log_level=self.config.logging.level.lower(),
-            access_log=True
+            access_log=True,
+            # Live-feed messages are small and identical for every client;
+            # per-connection deflate would compress the same payload N times
+            ws_per_message_deflate=False,
         )
         
         server = uvicorn.Server(config)
@@ -6,6 +6,8 @@ import argparse
 from datetime import datetime
 from pathlib import Path
 
+from sqlalchemy import text
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -244,6 +246,13 @@ def migrate_votes(old_conn, new_session):
         new_session.add(new_vote)
         votes_migrated += 1
 
+    new_session.flush()
+
+    # Recompute the denormalized per-haiku vote counts
+    new_session.execute(text(
+        "UPDATE generated_haikus SET vote_count = "
+        "(SELECT COUNT(*) FROM votes WHERE votes.haiku_id = generated_haikus.id)"
+    ))
     new_session.commit()
 
     print(f"\n✓ Votes migrated: {votes_migrated}")
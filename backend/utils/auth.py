@@ -1,7 +1,9 @@
 """Authorization and user management utilities."""
 
 import logging
+import threading
 from datetime import datetime
+from typing import Optional, Set
 from sqlalchemy.orm import Session
 
 from ..database.models import User
@@ -9,6 +11,11 @@ from ..config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Usernames opted out of auto-collection - loaded on first use and kept in
+# sync by set_opt_out(), so auto-collect never has to query for it
+_opted_out_users: Optional[Set[str]] = None
+_opted_out_lock = threading.Lock()
+
 
 def get_or_create_user(session: Session, username: str) -> User:
     """Get or create a user record.
@@ -138,6 +145,43 @@ def demote_user(session: Session, username: str) -> User:
     return user
 
 
+def _load_opted_out() -> Set[str]:
+    """Load the set of opted-out usernames on first use.
+    
+    Returns:
+        Set of usernames that opted out of auto-collection
+    """
+    global _opted_out_users
+    
+    if _opted_out_users is not None:
+        return _opted_out_users
+    
+    with _opted_out_lock:
+        if _opted_out_users is None:
+            from ..database import get_session
+            
+            with get_session() as session:
+                rows = session.query(User.username).filter(User.opted_out == True)
+                _opted_out_users = {username for (username,) in rows}
+            logger.info(f"Loaded {len(_opted_out_users)} opted-out users")
+    
+    return _opted_out_users
+
+
+def is_opted_out(username: str) -> bool:
+    """Check if a user has opted out of auto-collection.
+    
+    Answered from memory; opt-outs must go through set_opt_out().
+    
+    Args:
+        username: Username to check
+        
+    Returns:
+        True if the user opted out
+    """
+    return username in _load_opted_out()
+
+
 def set_opt_out(session: Session, username: str, opted_out: bool) -> User:
     """Set user's opt-out status for auto-collection.
     
@@ -154,6 +198,12 @@ def set_opt_out(session: Session, username: str, opted_out: bool) -> User:
     session.commit()
     session.refresh(user)
     
+    opted_out_users = _load_opted_out()
+    if opted_out:
+        opted_out_users.add(username)
+    else:
+        opted_out_users.discard(username)
+    
     logger.info(f"Set opt-out for {username}: {opted_out}")
     
     return user
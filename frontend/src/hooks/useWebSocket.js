@@ -7,6 +7,9 @@ const getWebSocketURL = () => {
   return `${protocol}//${host}/ws/live`;
 };
 
+// Server sends UTF-8 JSON in binary frames
+const textDecoder = new TextDecoder();
+
 export function useWebSocket() {
   const [isConnected, setIsConnected] = useState(false);
   const [lastMessage, setLastMessage] = useState(null);
@@ -19,6 +22,7 @@ export function useWebSocket() {
       const wsUrl = getWebSocketURL();
       console.log('Connecting to WebSocket:', wsUrl);
       ws.current = new WebSocket(wsUrl);
+      ws.current.binaryType = 'arraybuffer';
 
       ws.current.onopen = () => {
         console.log('WebSocket connected');
@@ -34,7 +38,8 @@ export function useWebSocket() {
 
       ws.current.onmessage = (event) => {
         try {
-          const data = JSON.parse(event.data);
+          const text = typeof event.data === 'string' ? event.data : textDecoder.decode(event.data);
+          const data = JSON.parse(text);
           setLastMessage(data);
 
           if (data.type === 'new_haiku' || data.type === 'new_line') {
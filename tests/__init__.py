@@ -0,0 +1 @@
+"""HaikuBot test suite."""
@@ -0,0 +1,26 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from backend.config import Config, set_config
+from backend.database import init_db
+
+
+@pytest.fixture
+def db():
+    """Fresh in-memory database."""
+    init_db("sqlite://")
+
+
+@pytest.fixture
+def config():
+    """Install a minimal global config for the duration of a test."""
+    config = Config(
+        database={"path": ":memory:"},
+        bot={"owner": "owner"},
+        servers=[],
+        admin={"username": "admin", "password": "secret", "secret_key": "test-key"},
+    )
+    set_config(config)
+    yield config
+    set_config(None)
@@ -0,0 +1,82 @@
+"""Tests for admin token authentication."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api import admin_routes
+
+# Any authenticated endpoint will do
+PROTECTED = "/admin/lines/flagged"
+
+
+@pytest.fixture
+def client(db, config):
+    """Admin API client with real token checks."""
+    app = FastAPI()
+    app.include_router(admin_routes.router)
+    return TestClient(app)
+
+
+def _login(client, password="secret"):
+    return client.post("/admin/login", json={"username": "admin", "password": password})
+
+
+def _auth(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_valid_token_is_accepted(client):
+    """A token from /admin/login opens protected endpoints."""
+    response = _login(client)
+    assert response.status_code == 200
+
+    assert client.get(PROTECTED, headers=_auth(response.json()["token"])).status_code == 200
+
+
+def test_wrong_password_is_rejected(client):
+    """Login with a bad password gets no token."""
+    response = _login(client, password="wrong")
+
+    assert response.status_code == 401
+    assert "token" not in response.json()
+
+
+def test_missing_token_is_rejected(client):
+    """Requests without a bearer token are unauthorized."""
+    assert client.get(PROTECTED).status_code == 401
+
+
+def test_tampered_signature_is_rejected(client):
+    """Changing the signature invalidates the token."""
+    token = _login(client).json()["token"]
+    payload, signature = token.split(".", 1)
+    tampered = f"{payload}.{'A' if signature[0] != 'A' else 'B'}{signature[1:]}"
+
+    response = client.get(PROTECTED, headers=_auth(tampered))
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid token"
+
+
+def test_expired_token_is_rejected(client, config, monkeypatch):
+    """Tokens older than token_ttl_hours are refused."""
+    issued_at = admin_routes.time.time() - config.admin.token_ttl_hours * 3600 - 60
+    with monkeypatch.context() as patch:
+        patch.setattr(admin_routes.time, "time", lambda: issued_at)
+        token = admin_routes._create_token("admin")
+
+    response = client.get(PROTECTED, headers=_auth(token))
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token expired"
+
+
+def test_changed_secret_key_invalidates_cached_token(client, config):
+    """A token verified under the old key fails once secret_key changes."""
+    token = _login(client).json()["token"]
+    assert client.get(PROTECTED, headers=_auth(token)).status_code == 200
+
+    config.admin.secret_key = "rotated-key"
+
+    assert client.get(PROTECTED, headers=_auth(token)).status_code == 401
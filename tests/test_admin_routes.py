@@ -0,0 +1,53 @@
+"""Tests for the admin API routes."""
+
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.admin_routes import router, verify_admin_token
+from backend.database import init_db, get_session, Line
+
+
+@pytest.fixture
+def client():
+    """Admin API client on a fresh in-memory database, with auth bypassed."""
+    init_db("sqlite://")
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[verify_admin_token] = lambda: True
+    return TestClient(app)
+
+
+def test_syllable_check_reports_mismatched_lines(client):
+    """Lines whose stored count disagrees with a recount are returned."""
+    with get_session() as session:
+        session.add_all([
+            Line(text="hello world", syllable_count=5, server="test", channel="#test",
+                 username="alice", timestamp=datetime(2024, 1, 1), source="auto"),
+            Line(text="an old silent pond", syllable_count=5, server="test", channel="#test",
+                 username="bob", timestamp=datetime(2024, 1, 2), source="auto"),
+        ])
+        session.commit()
+
+    response = client.post("/admin/syllable-check")
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["text"] for r in results] == ["hello world"]
+    assert results[0]["stored_syllables"] == 5
+    assert results[0]["actual_syllables"] == 3
+
+
+def test_syllable_check_skips_validated_lines(client):
+    """Human-validated lines are left out unless include_validated is set."""
+    with get_session() as session:
+        session.add(Line(text="hello world", syllable_count=5, server="test", channel="#test",
+                         username="alice", timestamp=datetime(2024, 1, 1), source="auto",
+                         human_validated=True))
+        session.commit()
+
+    assert client.post("/admin/syllable-check").json() == []
+    assert len(client.post("/admin/syllable-check?include_validated=true").json()) == 1
@@ -0,0 +1,70 @@
+"""Tests for the IRC bot's send helpers."""
+
+import types
+
+import irc.client
+import pytest
+
+from backend.irc.bot import HaikuBot
+
+
+class FakeSocket:
+    """Socket that records writes, optionally failing them."""
+
+    def __init__(self, error=None):
+        self.writes = []
+        self.error = error
+
+    def sendall(self, data):
+        if self.error:
+            raise self.error
+        self.writes.append(data)
+
+
+class FakeConnection:
+    """Just enough of irc.client.ServerConnection for send_notice_many."""
+
+    def __init__(self, socket):
+        self.socket = socket
+        self.disconnected = None
+
+    def encode(self, msg):
+        return msg.encode("utf-8")
+
+    def disconnect(self, message):
+        self.disconnected = message
+
+
+def _bot(connection):
+    return types.SimpleNamespace(connection=connection)
+
+
+def test_send_notice_many_writes_once():
+    """All notices go out in a single write; empty lines are skipped."""
+    sock = FakeSocket()
+    HaikuBot.send_notice_many(_bot(FakeConnection(sock)), "alice", ["one", "", "two"])
+
+    assert sock.writes == [b"NOTICE alice :one\r\nNOTICE alice :two\r\n"]
+
+
+def test_send_notice_many_not_connected():
+    """A missing socket raises like send_raw() does."""
+    with pytest.raises(irc.client.ServerNotConnectedError):
+        HaikuBot.send_notice_many(_bot(FakeConnection(None)), "alice", ["one"])
+
+
+def test_send_notice_many_rejects_bad_line_before_sending():
+    """One invalid line fails the call without sending a partial batch."""
+    sock = FakeSocket()
+    with pytest.raises(irc.client.MessageTooLong):
+        HaikuBot.send_notice_many(_bot(FakeConnection(sock)), "alice", ["ok", "x" * 600])
+
+    assert sock.writes == []
+
+
+def test_send_notice_many_disconnects_on_socket_error():
+    """A socket error drops the connection so the bot reconnects."""
+    connection = FakeConnection(FakeSocket(error=BrokenPipeError()))
+    HaikuBot.send_notice_many(_bot(connection), "alice", ["one"])
+
+    assert connection.disconnected == "Connection reset by peer."
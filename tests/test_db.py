@@ -0,0 +1,75 @@
+"""Tests for database initialization."""
+
+import sqlite3
+
+import pytest
+
+from backend.database import init_db
+
+
+def test_init_db_twice_on_new_file(tmp_path):
+    """init_db can create a fresh database and then reopen it."""
+    url = f"sqlite:///{tmp_path / 'haiku.db'}"
+
+    init_db(url)
+    init_db(url)
+
+
+def test_init_db_adds_missing_indexes(tmp_path):
+    """Indexes added after a database was created are created on startup."""
+    db_path = tmp_path / "haiku.db"
+    url = f"sqlite:///{db_path}"
+    init_db(url)
+
+    # Simulate a database from before the expression and partial indexes
+    conn = sqlite3.connect(db_path)
+    conn.execute("DROP INDEX idx_lines_text_lower")
+    conn.execute("DROP INDEX idx_lines_unvalidated_ts")
+    conn.commit()
+    conn.close()
+
+    init_db(url)
+
+    conn = sqlite3.connect(db_path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    conn.close()
+    assert {"idx_lines_text_lower", "idx_lines_unvalidated_ts"} <= names
+
+
+def test_init_db_adds_vote_count_to_old_database(tmp_path):
+    """Databases without generated_haikus.vote_count get it backfilled."""
+    db_path = tmp_path / "haiku.db"
+    url = f"sqlite:///{db_path}"
+    init_db(url)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO lines (text, syllable_count, server, channel, username, timestamp, source, "
+        "human_validated, flagged_for_deletion) "
+        "VALUES ('an old silent pond', 5, 's', '#c', 'alice', '2024-01-01', 'manual', 0, 0)"
+    )
+    conn.execute(
+        "INSERT INTO generated_haikus (line1_id, line2_id, line3_id, full_text, generated_at, "
+        "triggered_by, server, channel) VALUES (1, 1, 1, 'x', '2024-01-01', 'alice', 's', '#c')"
+    )
+    conn.execute("INSERT INTO votes (haiku_id, username, voted_at) VALUES (1, 'alice', '2024-01-01')")
+    conn.execute("INSERT INTO votes (haiku_id, username, voted_at) VALUES (1, 'bob', '2024-01-01')")
+    # Simulate a database from before the column existed
+    conn.execute("ALTER TABLE generated_haikus DROP COLUMN vote_count")
+    conn.commit()
+    conn.close()
+
+    init_db(url)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT vote_count FROM generated_haikus WHERE id = 1").fetchone() == (2,)
+    conn.close()
+
+
+def test_init_db_rejects_old_sqlite(tmp_path, monkeypatch):
+    """init_db refuses SQLite builds without RETURNING support."""
+    monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 31, 1))
+    monkeypatch.setattr(sqlite3, "sqlite_version", "3.31.1")
+
+    with pytest.raises(RuntimeError, match="3.35.0"):
+        init_db(f"sqlite:///{tmp_path / 'haiku.db'}")
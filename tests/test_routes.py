@@ -0,0 +1,91 @@
+"""Tests for the public API routes."""
+
+import base64
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.routes import router, NEXT_CURSOR_HEADER
+from backend.database import get_session, Line
+
+
+@pytest.fixture
+def client(db):
+    """Public API client on a fresh in-memory database."""
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def _add_lines(timestamps):
+    """Store one line per timestamp and return their IDs in insert order."""
+    with get_session() as session:
+        lines = [
+            Line(text=f"line {i}", syllable_count=5, server="test", channel="#test",
+                 username="alice", timestamp=ts, source="manual")
+            for i, ts in enumerate(timestamps)
+        ]
+        session.add_all(lines)
+        session.commit()
+        return [line.id for line in lines]
+
+
+def _fetch_all(client, url, limit):
+    """Follow X-Next-Cursor until the last page; return the pages of IDs."""
+    pages = []
+    params = {"limit": limit}
+    while True:
+        response = client.get(url, params=params)
+        assert response.status_code == 200
+        pages.append([row["id"] for row in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        params = {"limit": limit, "cursor": cursor}
+
+
+def test_lines_cursor_pages_without_overlap_or_gaps(client):
+    """Following the cursor visits every line exactly once, newest first."""
+    ids = _add_lines([datetime(2024, 1, day) for day in range(1, 8)])
+
+    pages = _fetch_all(client, "/lines", limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [i for page in pages for i in page] == list(reversed(ids))
+
+
+def test_lines_cursor_breaks_timestamp_ties_by_id(client):
+    """Rows sharing a timestamp are split across pages by ID, none skipped."""
+    t1, t2 = datetime(2024, 1, 1), datetime(2024, 1, 2)
+    ids = _add_lines([t1, t1, t1, t2, t2, t2])
+
+    pages = _fetch_all(client, "/lines", limit=2)
+
+    expected = sorted(ids[3:], reverse=True) + sorted(ids[:3], reverse=True)
+    assert [i for page in pages for i in page] == expected
+
+
+def test_lines_full_last_page_ends_with_empty_page(client):
+    """An exactly full last page still gets a cursor, leading to an empty page."""
+    _add_lines([datetime(2024, 1, day) for day in range(1, 5)])
+
+    pages = _fetch_all(client, "/lines", limit=2)
+
+    assert [len(page) for page in pages] == [2, 2, 0]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"no separator").decode(),
+    base64.urlsafe_b64encode(b"2024-01-01T00:00:00|abc").decode(),
+    base64.urlsafe_b64encode(b"yesterday|1").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe|1").decode(),
+])
+def test_lines_malformed_cursor_is_400(client, cursor):
+    """A cursor that doesn't decode is a client error, not a server error."""
+    response = client.get("/lines", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
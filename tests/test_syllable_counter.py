@@ -0,0 +1,74 @@
+"""Tests for syllable counting."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from backend.haiku import syllable_counter
+
+
+def test_perl_failure_is_not_cached(monkeypatch):
+    """A Python fallback count is not reused once Perl works again."""
+    monkeypatch.setattr(syllable_counter, "_acronym_cache", {})
+    monkeypatch.setattr(syllable_counter, "_perl_word_cache", {})
+    monkeypatch.setattr(syllable_counter, "_perl_text_cache", {})
+
+    calls = []
+
+    def fake_word_by_word(text, perl_counts=None, limit=None):
+        calls.append(text)
+        return 0 if len(calls) == 1 else 42
+
+    monkeypatch.setattr(syllable_counter, "_count_syllables_perl_word_by_word", fake_word_by_word)
+
+    text = "an old silent pond"
+    assert syllable_counter.count_syllables(text) == syllable_counter.count_syllables(text, method="python")
+    assert syllable_counter.count_syllables(text) == 42
+    assert syllable_counter.count_syllables(text) == 42
+    assert calls == [text, text]
+
+
+requires_perl = pytest.mark.skipif(shutil.which("perl") is None, reason="perl not installed")
+
+
+@requires_perl
+def test_perl_worker_respawns_after_process_dies():
+    """A dead coprocess is replaced on the next count."""
+    worker = syllable_counter._PerlWorker()
+    try:
+        assert worker.count("hello world") == 3
+        first = worker._proc
+        first.kill()
+        first.wait()
+
+        assert worker.count("an old silent pond") == 5
+        assert worker._proc is not first
+        assert worker._proc.poll() is None
+    finally:
+        worker._stop()
+
+
+@requires_perl
+def test_perl_worker_restarts_after_timeout(tmp_path, monkeypatch):
+    """A coprocess that stops answering is killed, and the next call recovers."""
+    hung = tmp_path / "hung.pl"
+    hung.write_text("sleep 60;\n")
+    worker = syllable_counter._PerlWorker(timeout=0.2)
+    try:
+        with monkeypatch.context() as patch:
+            patch.setattr(syllable_counter, "_PERL_SCRIPT_PATH", hung)
+            with pytest.raises(subprocess.TimeoutExpired):
+                worker.count("hello world")
+            assert worker._proc is None
+
+        assert worker.count("hello world") == 3
+    finally:
+        worker._stop()
+
+
+def test_exceeds_syllables_ignores_tokens_without_letters():
+    """Bare apostrophes and underscores do not count toward the word bound."""
+    seven_words = "one two three four five six seven"
+    assert not syllable_counter.exceeds_syllables(seven_words + " ' _", 7)
+    assert syllable_counter.exceeds_syllables(seven_words + " eight", 7)
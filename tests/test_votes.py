@@ -0,0 +1,99 @@
+"""Tests for voting and the denormalized GeneratedHaiku.vote_count."""
+
+import asyncio
+import types
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.routes import router
+from backend.database import get_session, Line, GeneratedHaiku, Vote
+from backend.irc.commands import CommandHandler
+
+
+@pytest.fixture
+def haiku_id(db):
+    """ID of a stored haiku with no votes."""
+    with get_session() as session:
+        line = Line(text="an old silent pond", syllable_count=5, server="test", channel="#test",
+                    username="alice", timestamp=datetime(2024, 1, 1), source="manual")
+        session.add(line)
+        session.flush()
+        haiku = GeneratedHaiku(line1_id=line.id, line2_id=line.id, line3_id=line.id,
+                               full_text="an old silent pond", triggered_by="alice",
+                               server="test", channel="#test")
+        session.add(haiku)
+        session.commit()
+        return haiku.id
+
+
+@pytest.fixture
+def client(db):
+    """Public API client on a fresh in-memory database."""
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+@pytest.fixture
+def commands(db, config):
+    """IRC command handler for a stand-in bot."""
+    return CommandHandler(types.SimpleNamespace(server_name="test"))
+
+
+def _stored_votes(haiku_id):
+    """Return (vote_count column, number of vote rows) for a haiku."""
+    with get_session() as session:
+        vote_count = session.get(GeneratedHaiku, haiku_id).vote_count
+        rows = session.query(Vote).filter(Vote.haiku_id == haiku_id).count()
+        return vote_count, rows
+
+
+def test_api_vote_increments_count(client, haiku_id):
+    """Each new voter bumps vote_count and adds one vote row."""
+    first = client.post(f"/haikus/{haiku_id}/vote", json={"username": "bob"})
+    second = client.post(f"/haikus/{haiku_id}/vote", json={"username": "carol"})
+
+    assert first.status_code == 200 and first.json()["vote_count"] == 1
+    assert second.status_code == 200 and second.json()["vote_count"] == 2
+    assert _stored_votes(haiku_id) == (2, 2)
+
+
+def test_api_duplicate_vote_is_400_and_keeps_count(client, haiku_id):
+    """A second vote from the same user is refused and rolled back."""
+    client.post(f"/haikus/{haiku_id}/vote", json={"username": "bob"})
+
+    response = client.post(f"/haikus/{haiku_id}/vote", json={"username": "bob"})
+
+    assert response.status_code == 400
+    assert _stored_votes(haiku_id) == (1, 1)
+
+
+def test_api_vote_for_missing_haiku_is_404(client, haiku_id):
+    """Voting for an unknown haiku is not found and stores nothing."""
+    response = client.post(f"/haikus/{haiku_id + 1}/vote", json={"username": "bob"})
+
+    assert response.status_code == 404
+    with get_session() as session:
+        assert session.query(Vote).count() == 0
+
+
+def test_irc_duplicate_vote_keeps_count(commands, haiku_id):
+    """!haikuvote twice from one user counts once."""
+    first = asyncio.run(commands._cmd_vote("bob", "#test", str(haiku_id)))
+    second = asyncio.run(commands._cmd_vote("bob", "#test", str(haiku_id)))
+
+    assert "now has 1 vote(s)" in first.message
+    assert "already voted" in second.message
+    assert _stored_votes(haiku_id) == (1, 1)
+
+
+def test_irc_vote_for_missing_haiku(commands, haiku_id):
+    """!haikuvote for an unknown haiku reports not found."""
+    response = asyncio.run(commands._cmd_vote("bob", "#test", str(haiku_id + 1)))
+
+    assert response.message == f"Haiku #{haiku_id + 1} not found."
+    with get_session() as session:
+        assert session.query(Vote).count() == 0
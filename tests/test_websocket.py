@@ -0,0 +1,90 @@
+"""Tests for the WebSocket connection manager."""
+
+import asyncio
+import json
+import threading
+
+from backend.api.websocket import ConnectionManager, QUEUE_SIZE
+
+
+class FakeWebSocket:
+    """Records what the manager sends; sends can be made to hang."""
+
+    def __init__(self, stalled=False):
+        self.sent = []
+        self.closed = False
+        self.stalled = stalled
+        self.received = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_bytes(self, payload):
+        if self.stalled:
+            await asyncio.Event().wait()  # Never completes
+        self.sent.append(json.loads(payload))
+        self.received.set()
+
+    async def close(self):
+        self.closed = True
+
+
+def test_full_queue_disconnects_slow_client():
+    """A client that stops draining its queue is dropped and closed."""
+    async def scenario():
+        manager = ConnectionManager()
+        slow, fast = FakeWebSocket(stalled=True), FakeWebSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+
+        # One message is held by the stalled writer, QUEUE_SIZE fill the
+        # queue, and the next one overflows it
+        for i in range(QUEUE_SIZE + 2):
+            await manager.broadcast({"n": i})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+
+        assert slow not in manager.active_connections
+        assert slow.closed
+        assert fast in manager.active_connections
+        assert manager.listener_count == 1
+        assert [m["n"] for m in fast.sent] == list(range(QUEUE_SIZE + 2))
+
+    asyncio.run(scenario())
+
+
+def test_broadcast_from_another_loop_reaches_server_loop():
+    """IRC threads broadcast from their own loops; delivery still happens."""
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket)
+
+        # Same shape as an IRC bot's loop thread calling broadcast_new_line
+        thread = threading.Thread(
+            target=lambda: asyncio.run(manager.broadcast({"type": "new_line"}))
+        )
+        thread.start()
+        thread.join()
+
+        await asyncio.wait_for(websocket.received.wait(), timeout=1)
+        assert websocket.sent == [{"type": "new_line"}]
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_stops_writer_and_updates_count():
+    """Disconnecting removes the client and cancels its writer task."""
+    async def scenario():
+        manager = ConnectionManager()
+        websocket = FakeWebSocket()
+        await manager.connect(websocket)
+        writer = manager._writers[websocket]
+
+        manager.disconnect(websocket)
+        await asyncio.sleep(0)
+
+        assert not manager.has_listeners()
+        assert writer.cancelled()
+
+    asyncio.run(scenario())